@@ -22,7 +22,7 @@
         python312Packages.venvShellHook
         python312Packages.pip
         python312Packages.numpy
-        python312Packages.pyaudio
+        python312Packages.sounddevice
         python312Packages.pyqt6
         python312Packages.pynput
         virtualenv
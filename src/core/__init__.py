@@ -1,10 +1,12 @@
 # Core module initialization
 from .speech_recognizer import SpeechRecognizer
+from .recognizer_process import RecognizerProcess
 from .audio_capture import AudioCapture, StreamingAudioCapture
 from .streaming_transcriber import StreamingTranscriber
 
 __all__ = [
     'SpeechRecognizer',
+    'RecognizerProcess',
     'AudioCapture',
     'StreamingAudioCapture',
     'StreamingTranscriber',
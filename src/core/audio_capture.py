@@ -8,14 +8,82 @@ This module provides classes for capturing audio from the microphone
 and processing it for speech recognition.
 """
 
+import logging
+import os
 import threading
-import time
 import wave
+from collections import deque
 from queue import Queue
 from typing import Callable, List, Optional, Tuple
 
 import numpy as np
-import pyaudio
+import sounddevice
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+logger = logging.getLogger(__name__)
+
+# Scale factor from int16 samples to floats in [-1.0, 1.0)
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# Voice activity detection settings
+VAD_AGGRESSIVENESS = 2  # 0 (least aggressive) to 3 (most aggressive)
+VAD_FRAME_MS = 20  # webrtcvad accepts 10, 20 or 30 ms frames
+VAD_WINDOW_SEC = 2.0  # How far back voiced frames are counted
+VAD_MIN_VOICED_FRAMES = 5  # Voiced frames in the window needed to report voice
+ENERGY_VAD_RMS_THRESHOLD = 0.01  # RMS level treated as voice when webrtcvad is unavailable
+
+# Scheduling for the PortAudio stream thread
+CAPTURE_THREAD_CPU = 0  # Core reserved for audio handling
+CAPTURE_THREAD_RT_PRIORITY = 10  # SCHED_FIFO priority, must not exceed the rtprio limit
+
+# Extra time capture_audio waits beyond the requested duration for the device
+CAPTURE_TIMEOUT_MARGIN_SEC = 2.0
+
+
+if numba is not None:
+    _INT16_ARRAY = numba.types.Array(numba.types.int16, 1, 'A')
+    _FLOAT32_ARRAY = numba.types.Array(numba.types.float32, 1, 'A')
+    
+    # Explicit signatures compile at import, not on the first call inside
+    # the stream callback; samples from np.frombuffer are read-only
+    @numba.njit(
+        [
+            numba.types.float64(_INT16_ARRAY, _FLOAT32_ARRAY),
+            numba.types.float64(_INT16_ARRAY.copy(readonly=True), _FLOAT32_ARRAY),
+        ],
+        fastmath=True, cache=True
+    )
+    def int16_to_float32(src, dst):
+        # Fused conversion and energy accumulation in a single pass
+        acc = 0.0
+        for i in range(len(src)):
+            v = src[i] * (1.0 / 32768.0)
+            dst[i] = v
+            acc += v * v
+        return acc
+else:
+    def int16_to_float32(src: np.ndarray, dst: np.ndarray) -> float:
+        """
+        Normalize int16 samples into a float32 array.
+        
+        Args:
+            src: The int16 samples to convert.
+            dst: The float32 array to write to, of the same length as src.
+            
+        Returns:
+            The energy (sum of squares) of the normalized samples.
+        """
+        np.multiply(src, INT16_SCALE, out=dst, casting='unsafe')
+        return float(np.dot(dst, dst))
 
 
 class AudioCapture:
@@ -26,26 +94,34 @@ class AudioCapture:
     and processing it for speech recognition.
     """
     
-    def __init__(self, sample_rate: int = 16000, chunk_size: int = 1024,
-                 channels: int = 1, format_type: int = pyaudio.paInt16):
+    def __init__(self, sample_rate: int = 16000, chunk_size: int = 0,
+                 channels: int = 1):
         """
         Initialize the AudioCapture.
         
+        Audio is always captured as 16-bit signed integers.
+        
         Args:
             sample_rate: The sample rate to use for audio capture.
-            chunk_size: The size of each audio chunk.
+            chunk_size: The number of frames per stream callback.
+                If 0, PortAudio picks the optimal size for the device.
             channels: The number of audio channels (1 for mono, 2 for stereo).
-            format_type: The audio format type (from pyaudio).
         """
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
         self.channels = channels
-        self.format_type = format_type
         
-        self.pyaudio = pyaudio.PyAudio()
         self.stream = None
         self._running = False
         self._audio_buffer = np.array([])
+        
+        # Destination for capture_audio, filled with normalized samples by the stream callback
+        self._capture_target = None
+        self._capture_pos = 0
+        self._capture_done = threading.Event()
+        
+        # Scratch buffer for save_audio, resized to match the input
+        self._i16_scratch = None
     
     def start_stream(self):
         """
@@ -54,13 +130,14 @@ class AudioCapture:
         if self.stream is not None:
             self.stop_stream()
             
-        self.stream = self.pyaudio.open(
-            format=self.format_type,
+        self.stream = sounddevice.RawInputStream(
+            samplerate=self.sample_rate,
             channels=self.channels,
-            rate=self.sample_rate,
-            input=True,
-            frames_per_buffer=self.chunk_size
+            dtype='int16',
+            blocksize=self.chunk_size,
+            callback=self._stream_callback
         )
+        self.stream.start()
         self._running = True
     
     def stop_stream(self):
@@ -68,10 +145,48 @@ class AudioCapture:
         Stop the audio stream.
         """
         if self.stream is not None:
-            self.stream.stop_stream()
+            self.stream.stop()
             self.stream.close()
             self.stream = None
         self._running = False
+        
+        # Release any capture_audio call still waiting for samples
+        self._capture_done.set()
+    
+    def _stream_callback(self, in_data, frame_count: int, time_info,
+                         status: sounddevice.CallbackFlags):
+        """
+        Receive audio from PortAudio.
+        
+        This runs on PortAudio's audio thread and must not block.
+        
+        Args:
+            in_data: The captured audio data, as a buffer owned by PortAudio.
+            frame_count: The number of frames in in_data.
+            time_info: Timing information from PortAudio.
+            status: PortAudio status flags.
+        """
+        self._on_samples(np.frombuffer(in_data, dtype=np.int16))
+    
+    def _on_samples(self, samples: np.ndarray):
+        """
+        Handle samples delivered by the stream callback.
+        
+        Args:
+            samples: The captured int16 samples.
+        """
+        target = self._capture_target
+        if target is None:
+            return
+        
+        # Normalize straight into the destination array
+        n = min(len(samples), len(target) - self._capture_pos)
+        int16_to_float32(samples[:n], target[self._capture_pos:self._capture_pos + n])
+        self._capture_pos += n
+        
+        if self._capture_pos == len(target):
+            self._capture_target = None
+            self._capture_done.set()
     
     def capture_audio(self, duration: float) -> np.ndarray:
         """
@@ -82,20 +197,29 @@ class AudioCapture:
             
         Returns:
             The captured audio as a numpy array.
+            
+        Raises:
+            RuntimeError: If the device stops delivering audio.
         """
+        target = np.empty(int(self.sample_rate * duration) * self.channels, dtype=np.float32)
+        if len(target) == 0:
+            return np.array([], dtype=np.float32)
+        
+        self._capture_pos = 0
+        self._capture_done.clear()
+        self._capture_target = target
+        
         if not self._running:
             self.start_stream()
-            
-        frames = []
-        for _ in range(0, int(self.sample_rate / self.chunk_size * duration)):
-            data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-            frames.append(data)
         
-        # Convert to numpy array
-        audio_data = np.frombuffer(b''.join(frames), dtype=np.int16)
-        audio_data = audio_data.astype(np.float32) / 32768.0  # Normalize to [-1.0, 1.0]
+        finished = self._capture_done.wait(timeout=duration + CAPTURE_TIMEOUT_MARGIN_SEC)
+        self._capture_target = None
+        if not finished:
+            raise RuntimeError(
+                f"Audio device stopped delivering samples after {self._capture_pos} of {len(target)}"
+            )
         
-        return audio_data
+        return target[:self._capture_pos]
     
     def save_audio(self, audio_data: np.ndarray, filename: str):
         """
@@ -105,21 +229,23 @@ class AudioCapture:
             audio_data: The audio data to save.
             filename: The filename to save to.
         """
-        # Convert back to int16
-        audio_data = (audio_data * 32768.0).astype(np.int16)
+        # Convert back to int16. Scaling by 32767 rather than 32768 keeps
+        # a full-scale 1.0 sample from wrapping around to -32768.
+        if self._i16_scratch is None or self._i16_scratch.size != audio_data.size:
+            self._i16_scratch = np.empty(audio_data.size, dtype=np.int16)
+        np.multiply(audio_data, 32767.0, out=self._i16_scratch, casting='unsafe')
         
         with wave.open(filename, 'wb') as wf:
             wf.setnchannels(self.channels)
-            wf.setsampwidth(self.pyaudio.get_sample_size(self.format_type))
+            wf.setsampwidth(self._i16_scratch.itemsize)
             wf.setframerate(self.sample_rate)
-            wf.writeframes(audio_data.tobytes())
+            wf.writeframes(memoryview(self._i16_scratch).cast('B'))
     
     def __del__(self):
         """
         Clean up resources.
         """
         self.stop_stream()
-        self.pyaudio.terminate()
 
 
 class StreamingAudioCapture(AudioCapture):
@@ -137,6 +263,8 @@ class StreamingAudioCapture(AudioCapture):
         
         Args:
             callback: A function to call with the captured audio buffer.
+                The buffer is reused after the following call, so the callback
+                must copy it if it needs the audio for longer.
             buffer_duration: The duration of the audio buffer, in seconds.
             **kwargs: Additional arguments to pass to AudioCapture.
         """
@@ -146,8 +274,39 @@ class StreamingAudioCapture(AudioCapture):
         self.buffer_samples = int(self.sample_rate * buffer_duration)
         
         self._audio_buffer = np.zeros(self.buffer_samples, dtype=np.float32)
+        self._write_idx = 0
+        self.total_samples = 0  # Samples written since construction
+        self.snapshot_end = 0  # Value of total_samples for the last snapshot passed to the callback
         self._buffer_lock = threading.Lock()
+        
+        # Two snapshot buffers used alternately for the callback
+        self._snapshots = [np.empty(self.buffer_samples, dtype=np.float32) for _ in range(2)]
+        self._snapshot_idx = 0
         self._capture_thread = None
+        
+        # Set by the stream callback once a full segment has been captured
+        self._segment_ready = threading.Event()
+        self._segment_samples = 0
+        self._samples_since_segment = 0
+        
+        # Voice activity detection; without webrtcvad all audio counts as voiced
+        self._vad = webrtcvad.Vad(VAD_AGGRESSIVENESS) if webrtcvad is not None else None
+        self._vad_frame_samples = self.sample_rate * VAD_FRAME_MS // 1000
+        self._voiced_frames = deque(maxlen=int(VAD_WINDOW_SEC * 1000 / VAD_FRAME_MS))
+        self._voiced_count = 0
+        self._segment_energy = 0.0
+        self.has_voice = True
+        
+        # Raw int16 copy of the latest samples for the VAD, so it does not
+        # have to convert the float ring buffer back; sized in start_capturing
+        self._vad_ring = None
+        self._vad_write_idx = 0
+        self._vad_scratch = None
+        
+        # Set once the stream thread has been given realtime scheduling;
+        # problems are collected there and logged by the capture loop
+        self._stream_thread_scheduled = False
+        self._scheduling_errors: List[str] = []
     
     def start_capturing(self, segment_duration: float = 1.0):
         """
@@ -160,6 +319,18 @@ class StreamingAudioCapture(AudioCapture):
             return
             
         self._running = True
+        self._segment_samples = int(self.sample_rate * segment_duration)
+        self._samples_since_segment = 0
+        self._segment_ready.clear()
+        self._stream_thread_scheduled = False
+        
+        if self._vad is not None:
+            # Room for two segments, in case the capture loop falls behind
+            ring_samples = max(2 * self._segment_samples, self._vad_frame_samples)
+            self._vad_ring = np.zeros(ring_samples, dtype=np.int16)
+            self._vad_scratch = np.empty(ring_samples, dtype=np.int16)
+            self._vad_write_idx = 0
+        
         self._capture_thread = threading.Thread(
             target=self._capture_loop,
             args=(segment_duration,),
@@ -172,36 +343,221 @@ class StreamingAudioCapture(AudioCapture):
         Stop capturing audio.
         """
         self._running = False
+        self._segment_ready.set()
         if self._capture_thread is not None:
             self._capture_thread.join(timeout=1.0)
             self._capture_thread = None
     
+    def snapshot(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a linearized copy of the ring buffer, oldest sample first.
+        
+        Args:
+            out: An array of buffer_samples floats to copy into.
+                If None, a new array is allocated.
+        
+        Returns:
+            The buffered audio.
+        """
+        if out is None:
+            out = np.empty(self.buffer_samples, dtype=np.float32)
+        
+        w = self._write_idx
+        tail = self.buffer_samples - w
+        out[:tail] = self._audio_buffer[w:]
+        out[tail:] = self._audio_buffer[:w]
+        return out
+    
+    def _write_to_buffer(self, samples: np.ndarray) -> float:
+        """
+        Normalize int16 samples directly into the ring buffer.
+        
+        Args:
+            samples: The int16 samples to write.
+            
+        Returns:
+            The energy (sum of squares) of the written samples.
+        """
+        self.total_samples += len(samples)
+        
+        # Only the most recent buffer_samples samples can be kept
+        samples = samples[-self.buffer_samples:]
+        n = len(samples)
+        end = self._write_idx + n
+        
+        if end <= self.buffer_samples:
+            energy = int16_to_float32(samples, self._audio_buffer[self._write_idx:end])
+        else:
+            split = self.buffer_samples - self._write_idx
+            energy = int16_to_float32(samples[:split], self._audio_buffer[self._write_idx:])
+            energy += int16_to_float32(samples[split:], self._audio_buffer[:n - split])
+        
+        self._write_idx = end % self.buffer_samples
+        return energy
+    
+    def _write_to_vad_ring(self, samples: np.ndarray):
+        """
+        Copy int16 samples into the VAD ring.
+        
+        Args:
+            samples: The int16 samples to write.
+        """
+        ring = self._vad_ring
+        size = len(ring)
+        samples = samples[-size:]
+        n = len(samples)
+        end = self._vad_write_idx + n
+        
+        if end <= size:
+            ring[self._vad_write_idx:end] = samples
+        else:
+            split = size - self._vad_write_idx
+            ring[self._vad_write_idx:] = samples[:split]
+            ring[:n - split] = samples[split:]
+        
+        self._vad_write_idx = end % size
+    
+    def _read_vad_ring(self, n: int) -> np.ndarray:
+        """
+        Get the latest samples from the VAD ring, oldest sample first.
+        
+        Args:
+            n: The number of samples to get, at most the ring size.
+            
+        Returns:
+            A view of the VAD scratch buffer holding the samples.
+        """
+        ring = self._vad_ring
+        size = len(ring)
+        out = self._vad_scratch
+        start = (self._vad_write_idx - n) % size
+        
+        if start + n <= size:
+            out[:n] = ring[start:start + n]
+        else:
+            first = size - start
+            out[:first] = ring[start:]
+            out[first:n] = ring[:n - first]
+        return out[:n]
+    
+    def _update_voice_activity(self, samples: np.ndarray):
+        """
+        Run voice activity detection on newly captured samples.
+        
+        Updates has_voice with whether enough voiced frames were seen
+        within the last VAD_WINDOW_SEC seconds.
+        
+        Args:
+            samples: The newly captured int16 samples.
+        """
+        if self._vad is None:
+            return
+        
+        frame_samples = self._vad_frame_samples
+        for start in range(0, len(samples) - frame_samples + 1, frame_samples):
+            frame = samples[start:start + frame_samples].tobytes()
+            is_speech = self._vad.is_speech(frame, self.sample_rate)
+            
+            # Keep a running count of voiced frames in the window
+            if len(self._voiced_frames) == self._voiced_frames.maxlen:
+                self._voiced_count -= self._voiced_frames[0]
+            self._voiced_frames.append(is_speech)
+            self._voiced_count += is_speech
+        
+        self.has_voice = self._voiced_count >= VAD_MIN_VOICED_FRAMES
+    
+    def _on_samples(self, samples: np.ndarray):
+        """
+        Write samples delivered by the stream callback into the ring buffer.
+        
+        Args:
+            samples: The captured int16 samples.
+        """
+        if not self._stream_thread_scheduled:
+            # Only the thread delivering audio runs at realtime priority; the
+            # capture loop, the VAD and the callback stay at normal priority
+            self._stream_thread_scheduled = True
+            self._set_realtime_scheduling()
+        
+        # Still serve capture_audio calls made on a streaming capture
+        super()._on_samples(samples)
+        
+        with self._buffer_lock:
+            self._segment_energy += self._write_to_buffer(samples)
+            if self._vad_ring is not None:
+                self._write_to_vad_ring(samples)
+        
+        self._samples_since_segment += len(samples)
+        if self._samples_since_segment >= self._segment_samples:
+            self._samples_since_segment = 0
+            self._segment_ready.set()
+    
+    def _set_realtime_scheduling(self):
+        """
+        Pin the calling thread to the audio core and give it realtime priority.
+        
+        This is called from the stream callback, so failures are only
+        recorded here and logged later by the capture loop.
+        
+        Realtime scheduling needs CAP_SYS_NICE or an rtprio limit of at least
+        CAPTURE_THREAD_RT_PRIORITY (e.g. "@audio - rtprio 95" in
+        /etc/security/limits.conf). Failures are otherwise ignored.
+        """
+        try:
+            os.sched_setaffinity(0, {CAPTURE_THREAD_CPU})
+        except (AttributeError, OSError) as e:
+            self._scheduling_errors.append(f"Could not pin stream thread to CPU {CAPTURE_THREAD_CPU}: {e}")
+        
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO,
+                                  os.sched_param(CAPTURE_THREAD_RT_PRIORITY))
+        except (AttributeError, OSError) as e:
+            self._scheduling_errors.append(f"Could not enable realtime scheduling for stream thread: {e}")
+    
     def _capture_loop(self, segment_duration: float):
         """
         The main capture loop.
         
+        Waits for the stream callback to signal a full segment, then passes
+        the current buffer to the callback.
+        
         Args:
             segment_duration: The duration of each audio segment to capture.
         """
         self.start_stream()
+        last_total = self.total_samples
         
         try:
             while self._running:
-                # Capture audio segment
-                audio_segment = self.capture_audio(segment_duration)
+                self._segment_ready.wait()
+                self._segment_ready.clear()
+                if not self._running:
+                    break
+                
+                while self._scheduling_errors:
+                    logger.warning("%s", self._scheduling_errors.pop(0))
+                
+                audio_buffer = self._snapshots[self._snapshot_idx]
+                self._snapshot_idx ^= 1
                 
-                # Update buffer
                 with self._buffer_lock:
-                    # Shift buffer and add new segment
-                    segment_samples = len(audio_segment)
-                    if segment_samples > 0:
-                        self._audio_buffer = np.roll(self._audio_buffer, -segment_samples)
-                        self._audio_buffer[-segment_samples:] = audio_segment[-segment_samples:]
-                        
-                        # Call the callback with the current buffer
-                        self.callback(np.copy(self._audio_buffer))
+                    self.snapshot(out=audio_buffer)
+                    total = self.total_samples
+                    energy = self._segment_energy
+                    self._segment_energy = 0.0
+                    new_samples = min(total - last_total, self.buffer_samples)
+                    if new_samples > 0 and self._vad_ring is not None:
+                        vad_samples = self._read_vad_ring(min(new_samples, len(self._vad_ring)))
+                last_total = total
+                
+                # Run voice activity detection on the samples added since the last segment
+                if new_samples > 0 and self._vad_ring is not None:
+                    self._update_voice_activity(vad_samples)
+                elif new_samples > 0:
+                    self.has_voice = np.sqrt(energy / new_samples) >= ENERGY_VAD_RMS_THRESHOLD
                 
-                # Small sleep to prevent CPU overuse
-                time.sleep(0.01)
+                # Call the callback with the current buffer
+                self.snapshot_end = total
+                self.callback(audio_buffer)
         finally:
             self.stop_stream()
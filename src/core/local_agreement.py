@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LocalAgreement-2 commit policy for streaming transcription.
+
+This module decides which words of a sliding-window decoding pass are
+final. A word is committed once two passes in a row agree on it, so a
+word spanning a segment boundary is corrected by the next pass instead
+of being split.
+"""
+
+from typing import Dict, List, Tuple
+
+
+def local_agreement(words: List[Dict], previous_words: List[Dict], window_len: int,
+                    flush: bool = False, sample_rate: int = 16000
+                    ) -> Tuple[List[str], int, List[Dict]]:
+    """
+    Run one LocalAgreement-2 step over the words of a decoding pass.
+    
+    Args:
+        words: The words of this pass, as dicts with "word" and "end" keys,
+            with end times in seconds from the start of the window.
+        previous_words: The words the previous pass left uncommitted.
+        window_len: The number of samples in the decoded window.
+        flush: Whether no more audio will be added to the window (speech
+            ended, or the window is full), so every word is final.
+        sample_rate: The sample rate of the window.
+    
+    Returns:
+        A tuple of (commit, cut, pending): the word strings to commit, the
+        number of samples to drop from the start of the window, and the
+        words left uncommitted, to pass as previous_words next time.
+    """
+    if flush:
+        return [word["word"] for word in words], window_len, []
+    
+    # Commit the longest prefix both passes agree on
+    agreed = 0
+    for word, previous in zip(words, previous_words):
+        if word["word"].strip() != previous["word"].strip():
+            break
+        agreed += 1
+    
+    if not agreed:
+        return [], 0, words
+    
+    cut = min(window_len, int(words[agreed - 1]["end"] * sample_rate))
+    return [word["word"] for word in words[:agreed]], cut, words[agreed:]
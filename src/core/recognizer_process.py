@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Out-of-process speech recognition.
+
+This module provides a class that runs a SpeechRecognizer in a separate
+process, so decoding does not compete for the GIL with audio capture
+and the UI.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+from .audio_capture import CAPTURE_THREAD_CPU
+from .speech_recognizer import SAMPLE_RATE, SpeechRecognizer
+
+logger = logging.getLogger(__name__)
+
+# How long close() waits for a request in flight before stopping the worker anyway
+CLOSE_TIMEOUT_SEC = 5.0
+
+
+def _avoid_capture_cpu():
+    """
+    Keep the calling process off the core reserved for audio capture.
+    
+    Threads started afterwards, such as CTranslate2's, inherit the
+    affinity. Failures are reported and ignored.
+    """
+    try:
+        cpus = os.sched_getaffinity(0) - {CAPTURE_THREAD_CPU}
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+    except (AttributeError, OSError) as e:
+        logger.warning("Could not keep recognizer off CPU %d: %s", CAPTURE_THREAD_CPU, e)
+
+
+def _serve(conn, shm_name: str, max_samples: int, model_size: str,
+           language: Optional[str], device: Optional[str],
+           compute_type: Optional[str]):
+    """
+    Run a SpeechRecognizer and answer requests until told to stop.
+    
+    This is the entry point of the worker process.
+    
+    Args:
+        conn: The worker end of the request pipe.
+        shm_name: The name of the shared memory block holding the audio.
+        max_samples: The number of float32 samples the block can hold.
+        model_size: The size of the Whisper model to use.
+        language: The language code to use for transcription.
+        device: The device to use for inference.
+        compute_type: The quantization type to use for inference.
+    """
+    # Ctrl+C goes to the whole process group; the parent shuts us down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _avoid_capture_cpu()
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        try:
+            recognizer = SpeechRecognizer(model_size, language, device, compute_type)
+        except Exception as e:
+            conn.send(("error", str(e)))
+            return
+        conn.send(("ok", (recognizer.device, recognizer.compute_type)))
+        
+        audio = np.ndarray((max_samples,), dtype=np.float32, buffer=shm.buf)
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            
+            method, language, args, kwargs = request
+            recognizer.language = language
+            try:
+                if method == "transcribe_audio":
+                    n, sr = args
+                    result = recognizer.transcribe_audio(audio[:n], sr, **kwargs)
+                else:
+                    result = getattr(recognizer, method)(*args, **kwargs)
+                conn.send(("ok", result))
+            except Exception as e:
+                conn.send(("error", str(e)))
+        del audio
+    finally:
+        shm.close()
+
+
+class RecognizerProcess:
+    """
+    A SpeechRecognizer running in a separate process.
+    
+    This class provides the same transcription methods as SpeechRecognizer.
+    Audio is passed through shared memory, so only decoding options and
+    results are pickled.
+    """
+    
+    def __init__(self, model_size: str = "base", language: Optional[str] = None,
+                 device: Optional[str] = None, compute_type: Optional[str] = None,
+                 max_samples: int = SAMPLE_RATE * 30):
+        """
+        Initialize the RecognizerProcess and wait for the model to load.
+        
+        Args:
+            model_size: The size of the Whisper model to use.
+            language: The language code to use for transcription.
+            device: The device to use for inference.
+            compute_type: The quantization type to use for inference.
+            max_samples: The largest number of samples that can be passed
+                to transcribe_audio in one call.
+        """
+        self.model_size = model_size
+        self.language = language
+        self.max_samples = max_samples
+        
+        self._shm = shared_memory.SharedMemory(create=True, size=max_samples * 4)
+        self._audio = np.ndarray((max_samples,), dtype=np.float32, buffer=self._shm.buf)
+        self._request_lock = threading.Lock()
+        
+        # Spawn rather than fork, since the parent may already be running threads
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_serve,
+            args=(child_conn, self._shm.name, max_samples, model_size,
+                  language, device, compute_type),
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        
+        try:
+            status, payload = self._conn.recv()
+        except (EOFError, OSError):
+            # The worker died while loading the model
+            self.close()
+            raise RuntimeError("Could not load Whisper model: the worker process exited")
+        if status == "error":
+            self.close()
+            raise RuntimeError(f"Could not load Whisper model: {payload}")
+        self.device, self.compute_type = payload
+    
+    def _request(self, method: str, *args, **kwargs):
+        """
+        Send a request to the worker process and wait for its reply.
+        
+        The request lock must be held by the caller.
+        
+        Args:
+            method: The SpeechRecognizer method to call.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+        
+        Returns:
+            The return value of the method.
+        """
+        if self._process is None:
+            raise RuntimeError("The recognizer process has been closed")
+        self._conn.send((method, self.language, args, kwargs))
+        status, payload = self._conn.recv()
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+    
+    def transcribe_file(self, audio_path: str) -> Dict:
+        """
+        Transcribe an audio file.
+        
+        Args:
+            audio_path: Path to the audio file to transcribe.
+        
+        Returns:
+            A dictionary containing the transcription results.
+        """
+        with self._request_lock:
+            return self._request("transcribe_file", audio_path)
+    
+    def transcribe_audio(self, audio_data: np.ndarray, sr: int = 16000, **options) -> Dict:
+        """
+        Transcribe audio data.
+        
+        Args:
+            audio_data: Audio data as a numpy array.
+            sr: Sample rate of the audio data.
+            **options: Additional decoding options to pass to faster-whisper.
+        
+        Returns:
+            A dictionary containing the transcription results.
+        """
+        n = len(audio_data)
+        if n > self.max_samples:
+            raise ValueError(f"Audio too long: {n} samples, at most {self.max_samples} supported")
+        
+        with self._request_lock:
+            if self._process is None:
+                raise RuntimeError("The recognizer process has been closed")
+            self._audio[:n] = audio_data
+            return self._request("transcribe_audio", n, sr, **options)
+    
+    def detect_language(self, audio_path: str) -> str:
+        """
+        Detect the language of an audio file.
+        
+        Args:
+            audio_path: Path to the audio file.
+        
+        Returns:
+            The detected language code.
+        """
+        with self._request_lock:
+            return self._request("detect_language", audio_path)
+    
+    def close(self):
+        """
+        Stop the worker process and release the shared memory.
+        
+        A request in flight is given CLOSE_TIMEOUT_SEC to finish; after that
+        the worker is terminated.
+        """
+        if self._process is None:
+            return
+        
+        locked = self._request_lock.acquire(timeout=CLOSE_TIMEOUT_SEC)
+        try:
+            if self._process is None:
+                return
+            
+            if locked:
+                try:
+                    self._conn.send(None)
+                except OSError:
+                    pass
+                self._process.join(timeout=CLOSE_TIMEOUT_SEC)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+            
+            self._conn.close()
+            self._audio = None
+            self._shm.close()
+            self._shm.unlink()
+        finally:
+            if locked:
+                self._request_lock.release()
+    
+    def __del__(self):
+        """
+        Clean up resources.
+        """
+        if getattr(self, "_process", None) is not None:
+            self.close()
@@ -2,33 +2,36 @@
 # -*- coding: utf-8 -*-
 
 """
-Speech recognition module using OpenAI's Whisper.
+Speech recognition module using faster-whisper.
 
 This module provides classes for transcribing audio files and handling
-real-time audio capture and transcription.
+real-time audio capture and transcription. Whisper models are run with
+CTranslate2 using int8 (CPU) or int8/float16 (CUDA) quantization.
 """
 
 import os
-import tempfile
 import threading
 import time
 from typing import Callable, Dict, List, Optional, Union
 
+import ctranslate2
 import numpy as np
-import torch
-import whisper
+from faster_whisper import WhisperModel
+
+# Sample rate expected by Whisper models
+SAMPLE_RATE = 16000
 
 
 class SpeechRecognizer:
     """
-    A class for speech recognition using OpenAI's Whisper model.
+    A class for speech recognition using Whisper models via faster-whisper.
     
     This class provides methods for transcribing audio files and
     detecting the language of the audio.
     """
     
     def __init__(self, model_size: str = "base", language: Optional[str] = None,
-                 device: Optional[str] = None):
+                 device: Optional[str] = None, compute_type: Optional[str] = None):
         """
         Initialize the SpeechRecognizer.
         
@@ -39,15 +42,33 @@ class SpeechRecognizer:
                 If None, language will be auto-detected.
             device: The device to use for inference ("cuda", "cpu", etc.).
                 If None, will use CUDA if available, otherwise CPU.
+            compute_type: The CTranslate2 quantization type to use.
+                If None, will use "int8_float16" on CUDA and "int8" on CPU.
         """
         self.model_size = model_size
         self.language = language
         
         # Set device
         if device is None:
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
         else:
             self.device = device
+        
+        # Set compute type
+        if compute_type is None:
+            self.compute_type = "int8_float16" if self.device == "cuda" else "int8"
+        else:
+            self.compute_type = compute_type
+        
+        # Greedy decoding at a fixed temperature for low, predictable latency
+        self._decode_opts = {
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": 0.0,
+            "condition_on_previous_text": True,
+            "word_timestamps": False,
+            "vad_filter": True,
+        }
             
         self.model = None
         self._load_model()
@@ -56,9 +77,79 @@ class SpeechRecognizer:
         """
         Load the Whisper model.
         """
-        print(f"Loading Whisper model '{self.model_size}' on {self.device}...")
-        self.model = whisper.load_model(self.model_size, device=self.device)
-        print(f"Model loaded successfully.")
+        print(f"Loading Whisper model '{self.model_size}' on {self.device} ({self.compute_type})...")
+        
+        # Leave two cores free so inference does not starve audio capture
+        cpu_threads = max(1, (os.cpu_count() or 1) - 2)
+        
+        self.model = WhisperModel(self.model_size, device=self.device,
+                                  compute_type=self.compute_type,
+                                  cpu_threads=cpu_threads, num_workers=1)
+        self._warm_up()
+        print("Model loaded successfully.")
+    
+    def _warm_up(self):
+        """
+        Run a dummy transcription so the first real call does not pay for
+        lazy device and kernel initialization.
+        
+        The real decoding options are used, so the same decode path is
+        warmed up; only the VAD is turned off, since it would drop the
+        silent input.
+        """
+        dummy = np.zeros(SAMPLE_RATE * 30, dtype=np.float32)
+        options = {**self._decode_opts, "vad_filter": False}
+        segments, _ = self.model.transcribe(dummy, language=self.language or "en", **options)
+        # Segments are generated lazily, so consume them to run the decoder
+        for _ in segments:
+            pass
+    
+    def _transcribe(self, audio: Union[str, np.ndarray], **options) -> Dict:
+        """
+        Run the model and collect its output into a result dictionary.
+        
+        Args:
+            audio: Path to an audio file, or 16 kHz float32 audio data.
+            **options: Decoding options to pass to faster-whisper.
+            
+        Returns:
+            A dictionary with "text", "segments", "language" and
+            "language_probability" keys, matching the result format of
+            openai-whisper. Segment "words" are only filled in when
+            word_timestamps is enabled.
+        """
+        options = {**self._decode_opts, **options}
+        if self.language:
+            options["language"] = self.language
+        
+        segments, info = self.model.transcribe(audio, **options)
+        segments = [
+            {
+                "id": segment.id,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+                "no_speech_prob": segment.no_speech_prob,
+                "words": [
+                    {
+                        "word": word.word,
+                        "start": word.start,
+                        "end": word.end,
+                        "probability": word.probability,
+                    }
+                    for word in segment.words or ()
+                ],
+            }
+            for segment in segments
+        ]
+        
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+            "language_probability": info.language_probability,
+        }
     
     def transcribe_file(self, audio_path: str) -> Dict:
         """
@@ -70,28 +161,32 @@ class SpeechRecognizer:
         Returns:
             A dictionary containing the transcription results.
         """
-        options = {}
-        if self.language:
-            options["language"] = self.language
-        print(f"[DEBUG] Whisper options: {options}")
-        result = self.model.transcribe(audio_path, **options)
-        return result
+        return self._transcribe(audio_path)
     
-    def transcribe_audio(self, audio_data: np.ndarray, sr: int = 16000) -> Dict:
+    def transcribe_audio(self, audio_data: np.ndarray, sr: int = 16000, **options) -> Dict:
         """
         Transcribe audio data.
         
         Args:
             audio_data: Audio data as a numpy array.
             sr: Sample rate of the audio data.
+            **options: Additional decoding options to pass to faster-whisper.
             
         Returns:
             A dictionary containing the transcription results.
         """
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as f:
-            import soundfile as sf
-            sf.write(f.name, audio_data, sr)
-            return self.transcribe_file(f.name)
+        audio = np.ascontiguousarray(audio_data, dtype=np.float32)
+        
+        # Whisper expects 16 kHz input; resample in memory if needed
+        if sr != SAMPLE_RATE:
+            target_len = int(round(len(audio) * SAMPLE_RATE / sr))
+            audio = np.interp(
+                np.linspace(0, len(audio) - 1, target_len),
+                np.arange(len(audio)),
+                audio
+            ).astype(np.float32)
+        
+        return self._transcribe(audio, **options)
     
     def detect_language(self, audio_path: str) -> str:
         """
@@ -103,8 +198,6 @@ class SpeechRecognizer:
         Returns:
             The detected language code.
         """
-        audio = whisper.load_audio(audio_path)
-        audio = whisper.pad_or_trim(audio)
-        mel = whisper.log_mel_spectrogram(audio).to(self.device)
-        _, probs = self.model.detect_language(mel)
-        return max(probs, key=probs.get)
+        # Segments are decoded lazily, so this only runs language detection
+        _, info = self.model.transcribe(audio_path)
+        return info.language
@@ -9,14 +9,25 @@ using the SpeechRecognizer and AudioCapture classes.
 """
 
 import threading
-import time
 from typing import Callable, Dict, List, Optional, Union
 
 import numpy as np
 
 from .audio_capture import StreamingAudioCapture
+from .recognizer_process import RecognizerProcess
 from .speech_recognizer import SpeechRecognizer
 
+# Number of trailing characters of committed text used as the decoding prompt
+PROMPT_CHARS = 200
+
+# Segments with a higher no-speech probability are not added to the committed text
+NO_SPEECH_THRESHOLD = 0.6
+
+SENTENCE_TERMINATORS = (".", "?", "!")
+
+# Detected languages at least this likely are kept for the rest of the session
+LANGUAGE_PROBABILITY_THRESHOLD = 0.5
+
 
 class StreamingTranscriber:
     """
@@ -28,7 +39,8 @@ class StreamingTranscriber:
     
     def __init__(self, model_size: str = "base", language: Optional[str] = None,
                  device: Optional[str] = None, buffer_duration: float = 30.0,
-                 sample_rate: int = 16000):
+                 sample_rate: int = 16000, compute_type: Optional[str] = None,
+                 use_process: bool = True):
         """
         Initialize the StreamingTranscriber.
         
@@ -38,8 +50,17 @@ class StreamingTranscriber:
             device: The device to use for inference.
             buffer_duration: The duration of the audio buffer, in seconds.
             sample_rate: The sample rate to use for audio capture.
+            compute_type: The quantization type to use for inference.
+            use_process: Whether to run the model in a separate process,
+                so decoding does not hold the GIL needed by audio capture.
         """
-        self.recognizer = SpeechRecognizer(model_size, language, device)
+        buffer_samples = int(sample_rate * buffer_duration)
+        if use_process:
+            self.recognizer = RecognizerProcess(model_size, language, device, compute_type,
+                                                max_samples=buffer_samples)
+        else:
+            self.recognizer = SpeechRecognizer(model_size, language, device, compute_type)
+        self.language = language
         self.sample_rate = sample_rate
         self.buffer_duration = buffer_duration
         
@@ -52,7 +73,21 @@ class StreamingTranscriber:
         self._transcription_thread = None
         self._audio_capture = None
         self._last_transcription = ""
-        self._transcription_lock = threading.Lock()
+        
+        # Triple-buffered handoff from the capture thread to the transcription
+        # thread: the capture thread fills the back buffer while the model reads
+        # the front buffer, and the latest complete buffer waits in the middle.
+        # The lock only guards the index swaps, never a copy.
+        self._buffers = [np.empty(buffer_samples, dtype=np.float32) for _ in range(3)]
+        self._buffer_ends = [0, 0, 0]  # Absolute sample index just past each buffer
+        self._back, self._middle, self._front = 0, 1, 2
+        self._middle_fresh = False
+        self._swap_lock = threading.Lock()
+        self._audio_ready = threading.Event()
+        
+        # Audio before this point has been transcribed and will not be decoded again
+        self._committed_until_sec = 0.0
+        self._committed_text = ""
     
     def start(self, segment_duration: float = 1.0):
         """
@@ -65,6 +100,13 @@ class StreamingTranscriber:
             return
             
         self._running = True
+        self._middle_fresh = False
+        self._audio_ready.clear()
+        self._committed_until_sec = 0.0
+        self._committed_text = ""
+        
+        # Detect the language again for each session unless one was given
+        self.recognizer.language = self.language
         
         # Initialize audio capture
         self._audio_capture = StreamingAudioCapture(
@@ -93,6 +135,7 @@ class StreamingTranscriber:
             return
             
         self._running = False
+        self._audio_ready.set()
         
         # Stop audio capture
         if self._audio_capture is not None:
@@ -106,6 +149,14 @@ class StreamingTranscriber:
         
         print("Streaming transcription stopped")
     
+    def close(self):
+        """
+        Stop the streaming transcription and release the model.
+        """
+        self.stop()
+        if isinstance(self.recognizer, RecognizerProcess):
+            self.recognizer.close()
+    
     def _process_audio(self, audio_buffer: np.ndarray):
         """
         Process the audio buffer.
@@ -116,14 +167,24 @@ class StreamingTranscriber:
         Args:
             audio_buffer: The audio buffer to process.
         """
-        with self._transcription_lock:
-            self._current_audio = audio_buffer
-            
-            # Call interim result callback if available
-            if self.on_interim_result is not None:
-                # Here we could implement a faster, less accurate interim result
-                # For now, we'll just pass the last transcription
-                self.on_interim_result(self._last_transcription)
+        audio_capture = self._audio_capture
+        
+        back = self._back
+        np.copyto(self._buffers[back], audio_buffer)
+        if audio_capture is not None:
+            self._buffer_ends[back] = audio_capture.snapshot_end
+        
+        # Publish the filled buffer and take the stale one back for writing
+        with self._swap_lock:
+            self._back, self._middle = self._middle, back
+            self._middle_fresh = True
+        self._audio_ready.set()
+        
+        # Call interim result callback if available
+        if self.on_interim_result is not None:
+            # Here we could implement a faster, less accurate interim result
+            # For now, we'll just pass the last transcription
+            self.on_interim_result(self._last_transcription)
     
     def _transcription_loop(self):
         """
@@ -133,27 +194,76 @@ class StreamingTranscriber:
         transcribes the audio buffer.
         """
         while self._running:
-            # Get the current audio buffer
-            with self._transcription_lock:
-                if not hasattr(self, '_current_audio'):
-                    time.sleep(0.1)
+            # Wait for the capture thread to publish a new buffer
+            self._audio_ready.wait(timeout=1.0)
+            self._audio_ready.clear()
+            
+            # Take the latest published buffer
+            with self._swap_lock:
+                if not self._middle_fresh:
                     continue
-                    
-                audio_buffer = self._current_audio
+                self._front, self._middle = self._middle, self._front
+                self._middle_fresh = False
+            
+            audio_buffer = self._buffers[self._front]
+            buffer_end = self._buffer_ends[self._front]
+            
+            # Skip the model entirely while nobody is speaking
+            audio_capture = self._audio_capture
+            if audio_capture is not None and not audio_capture.has_voice:
+                continue
+            
+            # Only decode the tail that has not been committed yet
+            buffer_start_sec = (buffer_end - len(audio_buffer)) / self.sample_rate
+            window_start_sec = max(self._committed_until_sec, buffer_start_sec)
+            offset = int((window_start_sec - buffer_start_sec) * self.sample_rate)
+            window = audio_buffer[offset:]
+            if len(window) == 0:
+                continue
             
             # Transcribe the audio
             try:
-                result = self.recognizer.transcribe_audio(audio_buffer, self.sample_rate)
+                result = self.recognizer.transcribe_audio(
+                    window, self.sample_rate,
+                    initial_prompt=self._committed_text[-PROMPT_CHARS:] or None,
+                    condition_on_previous_text=True
+                )
                 text = result["text"].strip()
                 
                 # Update last transcription
                 self._last_transcription = text
                 
+                # Keep the first confidently detected language so later
+                # segments skip language detection
+                if (self.recognizer.language is None and text
+                        and result.get("language_probability", 0.0) >= LANGUAGE_PROBABILITY_THRESHOLD):
+                    self.recognizer.language = result["language"]
+                
+                self._commit_segments(result.get("segments", []), window_start_sec)
+                
                 # Call transcription callback if available
                 if self.on_transcription is not None and text:
                     self.on_transcription(text, result)
             except Exception as e:
                 print(f"Error during transcription: {e}")
+    
+    def _commit_segments(self, segments: List[Dict], window_start_sec: float):
+        """
+        Advance the committed position past segments that are final.
+        
+        A segment is final if Whisper has already started a later segment,
+        or if it ends with a sentence terminator.
+        
+        Args:
+            segments: The segments of the latest transcription result.
+            window_start_sec: The absolute start time of the decoded window.
+        """
+        for i, segment in enumerate(segments):
+            segment_text = segment["text"].strip()
+            is_last = i == len(segments) - 1
+            if is_last and not segment_text.endswith(SENTENCE_TERMINATORS):
+                break
             
-            # Sleep to prevent CPU overuse
-            time.sleep(0.1)
+            self._committed_until_sec = window_start_sec + segment["end"]
+            if segment.get("no_speech_prob", 0.0) < NO_SPEECH_THRESHOLD:
+                self._committed_text = f"{self._committed_text} {segment_text}".strip()
@@ -11,7 +11,7 @@ import argparse
 import os
 import signal
 import sys
-import time
+import threading
 from typing import Dict, Optional
 
 from core import SpeechRecognizer, StreamingTranscriber
@@ -23,7 +23,7 @@ class LinuxWhisperer:
     """
     
     def __init__(self, model_size: str = "base", language: Optional[str] = None,
-                 device: Optional[str] = None):
+                 device: Optional[str] = None, compute_type: Optional[str] = None):
         """
         Initialize the Linux Whisperer application.
         
@@ -31,21 +31,27 @@ class LinuxWhisperer:
             model_size: The size of the Whisper model to use.
             language: The language code to use for transcription.
             device: The device to use for inference.
+            compute_type: The quantization type to use for inference.
         """
         self.model_size = model_size
         self.language = language
         self.device = device
+        self.compute_type = compute_type
         
         # Initialize transcriber
         self.transcriber = StreamingTranscriber(
             model_size=model_size,
             language=language,
-            device=device
+            device=device,
+            compute_type=compute_type
         )
         
         # Set up callbacks
         self.transcriber.on_transcription = self._on_transcription
         
+        # Set by the signal handler to end start()
+        self._stop_event = threading.Event()
+        
         # Register signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -57,24 +63,22 @@ class LinuxWhisperer:
         print(f"Starting Linux Whisperer with model '{self.model_size}'")
         print(f"Language: {self.language or 'auto-detect'}")
         print(f"Device: {self.device or 'auto-select'}")
+        print(f"Compute type: {self.compute_type or 'auto-select'}")
         print("Press Ctrl+C to stop")
         
         # Start transcription
         self.transcriber.start()
         
-        try:
-            # Keep the main thread alive
-            while True:
-                time.sleep(0.1)
-        except KeyboardInterrupt:
-            self.stop()
+        # Block the main thread until a stop signal arrives
+        self._stop_event.wait()
+        self.stop()
     
     def stop(self):
         """
         Stop the application.
         """
         print("Stopping Linux Whisperer...")
-        self.transcriber.stop()
+        self.transcriber.close()
         print("Stopped")
     
     def _on_transcription(self, text: str, result: Dict):
@@ -98,8 +102,7 @@ class LinuxWhisperer:
             sig: The signal number.
             frame: The current stack frame.
         """
-        self.stop()
-        sys.exit(0)
+        self._stop_event.set()
 
 
 def parse_args():
@@ -133,6 +136,14 @@ def parse_args():
         help="The device to use for inference (e.g., 'cuda', 'cpu')"
     )
     
+    parser.add_argument(
+        "--compute-type", "-c",
+        type=str,
+        default=None,
+        choices=["int8", "int8_float16", "float16", "float32"],
+        help="The quantization type to use for inference (e.g., 'float16' on CUDA)"
+    )
+    
     parser.add_argument(
         "--gui",
         action="store_true",
@@ -169,7 +180,8 @@ def main():
         app = LinuxWhisperer(
             model_size=args.model,
             language=args.language,
-            device=args.device
+            device=args.device,
+            compute_type=args.compute_type
         )
         app.start()
 
@@ -1,8 +1,16 @@
 # UI module initialization
 from .system_tray import SystemTrayApp
-from .transcription_window import TranscriptionWindow
 
 __all__ = [
     'SystemTrayApp',
     'TranscriptionWindow',
 ]
+
+
+def __getattr__(name):
+    # TranscriptionWindow pulls in the audio and transcription stack,
+    # so it is only imported on first access
+    if name == 'TranscriptionWindow':
+        from .transcription_window import TranscriptionWindow
+        return TranscriptionWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Icon cache for Linux Whisperer.
+
+This module provides cached access to the application icons, so each icon
+is looked up on disk and decoded only once per process.
+"""
+
+import functools
+import os
+
+from PyQt6.QtGui import QIcon
+
+# Directory containing the application icons
+ICONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "resources", "icons"
+)
+
+# Theme icon used when an icon file is missing
+FALLBACK_ICON_NAME = "audio-input-microphone"
+
+
+@functools.lru_cache(maxsize=None)
+def get_icon(name: str) -> QIcon:
+    """
+    Get an application icon by name.
+    
+    Args:
+        name: The icon name, without the ".png" extension.
+    
+    Returns:
+        The icon loaded from the resources directory, or a theme icon
+        if the file does not exist.
+    """
+    icon_path = os.path.join(ICONS_DIR, f"{name}.png")
+    
+    # Check if the icon file exists
+    if os.path.exists(icon_path):
+        return QIcon(icon_path)
+    
+    # Use a fallback icon
+    return QIcon.fromTheme(FALLBACK_ICON_NAME)
@@ -8,19 +8,35 @@ This module provides a system tray icon and menu for controlling
 the Linux Whisperer application.
 """
 
-import os
 import sys
 from typing import Callable, Dict, Optional
 
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QAction, QIcon, QActionGroup
+from PyQt6.QtGui import QAction, QActionGroup
 from PyQt6.QtWidgets import (
     QApplication, QMenu, QSystemTrayIcon, QWidget,
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QSlider, QComboBox, QCheckBox, QMessageBox
 )
 
-from .transcription_window import TranscriptionWindow
+from .icon_cache import get_icon
+
+# Whisper models offered in the settings menu
+MODELS = ("tiny", "base", "small", "medium", "large")
+
+# Languages offered in the settings menu, in addition to auto-detection
+LANGUAGES = (
+    ("en", "English"),
+    ("fr", "French"),
+    ("de", "German"),
+    ("es", "Spanish"),
+    ("it", "Italian"),
+    ("nl", "Dutch"),
+    ("pt", "Portuguese"),
+    ("ja", "Japanese"),
+    ("zh", "Chinese"),
+    ("ru", "Russian"),
+)
 
 
 class SystemTrayApp(QSystemTrayIcon):
@@ -57,6 +73,13 @@ class SystemTrayApp(QSystemTrayIcon):
         self.on_change_language = None
         self.on_exit = None
         
+        # Notifications are coalesced so only the latest one is shown
+        self._pending_notification = None
+        self._notification_timer = QTimer(self)
+        self._notification_timer.setSingleShot(True)
+        self._notification_timer.setInterval(50)
+        self._notification_timer.timeout.connect(self._flush_notification)
+        
         # Set up the system tray icon
         self._setup_icon()
         
@@ -66,7 +89,13 @@ class SystemTrayApp(QSystemTrayIcon):
         # Show the system tray icon
         self.show()
         
-        # Show a notification on startup
+        # Show a notification on startup, once the event loop is running
+        QTimer.singleShot(0, self._startup_notification)
+    
+    def _startup_notification(self):
+        """
+        Show the startup notification.
+        """
         self.showMessage(
             "Linux Whisperer",
             "Linux Whisperer is running in the system tray.",
@@ -74,22 +103,41 @@ class SystemTrayApp(QSystemTrayIcon):
             3000
         )
     
+    def _notify(self, message: str):
+        """
+        Show a short notification after a brief delay.
+        
+        If several notifications are requested within the delay, only the
+        last one is shown.
+        
+        Args:
+            message: The notification message.
+        """
+        self._pending_notification = message
+        if not self._notification_timer.isActive():
+            self._notification_timer.start()
+    
+    def _flush_notification(self):
+        """
+        Show the most recent notification passed to _notify.
+        """
+        message = self._pending_notification
+        if message is None:
+            return
+        self._pending_notification = None
+        
+        self.showMessage(
+            "Linux Whisperer",
+            message,
+            QSystemTrayIcon.MessageIcon.Information,
+            2000
+        )
+    
     def _setup_icon(self):
         """
         Set up the system tray icon.
         """
-        # Try to load the icon from the resources directory
-        icon_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "resources", "icons", "tray_icon.png"
-        )
-        
-        # Check if the icon file exists
-        if os.path.exists(icon_path):
-            self.setIcon(QIcon(icon_path))
-        else:
-            # Use a fallback icon
-            self.setIcon(QIcon.fromTheme("audio-input-microphone"))
+        self.setIcon(get_icon("tray_icon"))
     
     def _setup_menu(self):
         """
@@ -129,13 +177,15 @@ class SystemTrayApp(QSystemTrayIcon):
         # Add the model options
         model_group = QActionGroup(self.app)
         model_group.setExclusive(True)
+        model_group.triggered.connect(self._on_model_action)
         
-        for model_name in ["tiny", "base", "small", "medium", "large"]:
+        for model_name in MODELS:
             action = QAction(model_name, model_group)
             action.setCheckable(True)
             action.setChecked(model_name == self.selected_model)
-            action.triggered.connect(lambda checked, m=model_name: self._change_model(m))
-            model_menu.addAction(action)
+            action.setData(model_name)
+        
+        model_menu.addActions(model_group.actions())
         
         settings_menu.addMenu(model_menu)
         
@@ -145,32 +195,22 @@ class SystemTrayApp(QSystemTrayIcon):
         # Add the language options
         language_group = QActionGroup(self.app)
         language_group.setExclusive(True)
+        language_group.triggered.connect(self._on_language_action)
         
         # Add auto-detect option
         auto_action = QAction("Auto-detect", language_group)
         auto_action.setCheckable(True)
         auto_action.setChecked(self.selected_language is None)
-        auto_action.triggered.connect(lambda checked: self._change_language(None))
-        language_menu.addAction(auto_action)
+        auto_action.setData(None)
         
         # Add common languages
-        for lang_code, lang_name in [
-            ("en", "English"),
-            ("fr", "French"),
-            ("de", "German"),
-            ("es", "Spanish"),
-            ("it", "Italian"),
-            ("nl", "Dutch"),
-            ("pt", "Portuguese"),
-            ("ja", "Japanese"),
-            ("zh", "Chinese"),
-            ("ru", "Russian")
-        ]:
+        for lang_code, lang_name in LANGUAGES:
             action = QAction(f"{lang_name} ({lang_code})", language_group)
             action.setCheckable(True)
             action.setChecked(self.selected_language == lang_code)
-            action.triggered.connect(lambda checked, l=lang_code: self._change_language(l))
-            language_menu.addAction(action)
+            action.setData(lang_code)
+        
+        language_menu.addActions(language_group.actions())
         
         settings_menu.addMenu(language_menu)
         
@@ -206,12 +246,7 @@ class SystemTrayApp(QSystemTrayIcon):
                 self.on_start_listening()
                 
             # Show a notification
-            self.showMessage(
-                "Linux Whisperer",
-                "Started listening.",
-                QSystemTrayIcon.MessageIcon.Information,
-                2000
-            )
+            self._notify("Started listening.")
         else:
             self.toggle_listening_action.setText("Start Listening")
             
@@ -220,12 +255,7 @@ class SystemTrayApp(QSystemTrayIcon):
                 self.on_stop_listening()
                 
             # Show a notification
-            self.showMessage(
-                "Linux Whisperer",
-                "Stopped listening.",
-                QSystemTrayIcon.MessageIcon.Information,
-                2000
-            )
+            self._notify("Stopped listening.")
     
     def _toggle_whispering_mode(self, checked: bool):
         """
@@ -246,12 +276,25 @@ class SystemTrayApp(QSystemTrayIcon):
             self.on_toggle_whispering_mode(checked)
             
         # Show a notification
-        self.showMessage(
-            "Linux Whisperer",
-            f"Whispering mode {'enabled' if checked else 'disabled'}.",
-            QSystemTrayIcon.MessageIcon.Information,
-            2000
-        )
+        self._notify(f"Whispering mode {'enabled' if checked else 'disabled'}.")
+    
+    def _on_model_action(self, action: QAction):
+        """
+        Handle a model being picked from the settings menu.
+        
+        Args:
+            action: The triggered action, holding the model name as its data.
+        """
+        self._change_model(action.data())
+    
+    def _on_language_action(self, action: QAction):
+        """
+        Handle a language being picked from the settings menu.
+        
+        Args:
+            action: The triggered action, holding the language code as its data.
+        """
+        self._change_language(action.data())
     
     def _change_model(self, model_name: str):
         """
@@ -267,12 +310,7 @@ class SystemTrayApp(QSystemTrayIcon):
             self.on_change_model(model_name)
             
         # Show a notification
-        self.showMessage(
-            "Linux Whisperer",
-            f"Changed model to {model_name}.",
-            QSystemTrayIcon.MessageIcon.Information,
-            2000
-        )
+        self._notify(f"Changed model to {model_name}.")
     
     def _change_language(self, language_code: Optional[str]):
         """
@@ -289,30 +327,22 @@ class SystemTrayApp(QSystemTrayIcon):
             
         # Show a notification
         language_name = "auto-detect" if language_code is None else language_code
-        self.showMessage(
-            "Linux Whisperer",
-            f"Changed language to {language_name}.",
-            QSystemTrayIcon.MessageIcon.Information,
-            2000
-        )
+        self._notify(f"Changed language to {language_name}.")
     
     def _show_transcription_window(self):
         """
         Show the transcription window.
         """
         if self.transcription_window is None:
+            # Imported here so the transcription stack only loads when needed
+            from .transcription_window import TranscriptionWindow
+            
+            # Built once; closing the window only hides it
             self.transcription_window = TranscriptionWindow()
-            self.transcription_window.closed.connect(self._on_transcription_window_closed)
         
         self.transcription_window.show()
         self.transcription_window.activateWindow()
     
-    def _on_transcription_window_closed(self):
-        """
-        Handle the transcription window being closed.
-        """
-        self.transcription_window = None
-    
     def _show_about_dialog(self):
         """
         Show the about dialog.
@@ -335,6 +365,9 @@ class SystemTrayApp(QSystemTrayIcon):
         if self.on_exit is not None:
             self.on_exit()
         
+        if self.transcription_window is not None:
+            self.transcription_window.shutdown()
+        
         # Exit the application
         self.app.quit()
     
@@ -7,24 +7,63 @@ Transcription window for Linux Whisperer.
 This module provides a window for displaying real-time transcription results.
 """
 
-import os
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional
 
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QIcon, QFont, QTextCursor, QAction
+from PyQt6.QtCore import Qt, QIODevice, QSaveFile, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QTextCursor, QAction
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QTextEdit, QToolBar, QStatusBar,
-    QComboBox, QCheckBox, QSlider, QFileDialog
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QLabel, QPushButton, QPlainTextEdit, QToolBar, QStatusBar,
+    QComboBox, QCheckBox, QSlider
 )
 
 import threading
-import time
+from collections import deque
 from pynput import keyboard
 
-import pyaudio
 import numpy as np
-from core.streaming_transcriber import StreamingTranscriber
+import sounddevice as sd
+from core.audio_capture import ENERGY_VAD_RMS_THRESHOLD, int16_to_float32
+from core.local_agreement import local_agreement
+from core.streaming_transcriber import PROMPT_CHARS, StreamingTranscriber
+
+from .icon_cache import get_icon
+
+logger = logging.getLogger(__name__)
+
+# Audio is handed to the transcription thread in segments of this many
+# samples (1 second at 16 kHz)
+SEGMENT_SAMPLES = 16000
+
+# Longest stretch of uncommitted audio decoded at once (30 seconds at 16 kHz)
+WINDOW_SAMPLES = 480000
+
+# Segments queued for transcription beyond this are dropped, oldest first
+SEGMENT_QUEUE_SIZE = 30
+
+# Number of frames in each block delivered by the audio stream
+READ_FRAMES = 1024
+
+# Modifier keys of the Ctrl+Alt transcription hotkey, as bits of a mask
+HOTKEY_BITS = {
+    keyboard.Key.ctrl_l: 1,
+    keyboard.Key.ctrl_r: 1,
+    keyboard.Key.alt_l: 2,
+    keyboard.Key.alt_r: 2,
+}
+HOTKEY_MASK = 3
+
+# Transcription updates are batched and applied at most this often
+UPDATE_INTERVAL_MS = 100
+
+# Point sizes for the Small, Medium, Large and Extra Large font options
+FONT_SIZES = (10, 12, 14, 16)
+
+# Oldest text is dropped beyond this many characters, so long sessions
+# stay bounded; the transcript is a single paragraph, so a block limit
+# would not apply
+MAX_TRANSCRIPTION_CHARS = 200000
 
 LANGUAGES = [
     (None, "Auto"),
@@ -45,6 +84,13 @@ class TranscriptionWindow(QMainWindow):
     # Signals
     closed = pyqtSignal()
     transcription_updated = pyqtSignal(str)  # Signal for transcription updates
+    # Emitted from the hotkey thread; queued onto the main thread
+    _start_requested = pyqtSignal()
+    _stop_requested = pyqtSignal()
+    # Emitted from the file writer thread with the new status text
+    _status_changed = pyqtSignal(str)
+    # Emitted from the transcription thread with newly committed words
+    _text_committed = pyqtSignal(str)
     
     def __init__(self):
         """
@@ -54,23 +100,48 @@ class TranscriptionWindow(QMainWindow):
 
         self._transcribing = False
         self._transcription_buffer = []
+        self._committed_text = ""  # Tail of the text committed this session, used as the prompt
         self._audio_devices = []  # List of device dicts
         self._selected_device_index = None
         self._audio_thread = None
         self._audio_stream = None
         self._audio_thread_stop = threading.Event()
+        self._shutting_down = False
+        
+        # Incremented for every session; threads of an earlier session that
+        # are still finishing a decode must not commit into a later one
+        self._session = 0
+        
+        # Segments waiting for the transcription thread, oldest first;
+        # replaced, along with the stop and ready events, for every session
+        self._segment_queue = deque(maxlen=SEGMENT_QUEUE_SIZE)
+        self._segment_ready = threading.Event()
+        self._segment_thread = None
+        
+        # Transcription updates are coalesced and applied in one batch: a
+        # replacement text and/or newly committed text to append after it
+        self._pending_text: Optional[str] = None
+        self._pending_appends: List[str] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(UPDATE_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_transcription)
         
         # Connect the transcription_updated signal to the update_transcription slot
         self.transcription_updated.connect(self.update_transcription)
+        self._start_requested.connect(self.start_transcription, Qt.ConnectionType.QueuedConnection)
+        self._stop_requested.connect(self.stop_transcription, Qt.ConnectionType.QueuedConnection)
+        self._status_changed.connect(self._set_status, Qt.ConnectionType.QueuedConnection)
+        self._text_committed.connect(self._append_transcription, Qt.ConnectionType.QueuedConnection)
         # Language selection
         self.language_combo = QComboBox()
         for code, label in LANGUAGES:
             self.language_combo.addItem(label, code)
         self.language_combo.setCurrentIndex(0)
         # (Add to toolbar in _setup_toolbar)
-        # StreamingTranscriber instance for live transcription
+        # StreamingTranscriber holding the model process; the window captures
+        # and decodes audio itself, so the transcriber's own loop is not run
         self._transcriber = StreamingTranscriber()
-        self._transcriber.on_transcription = self._on_transcription_result
         self._hotkey_listener_thread = threading.Thread(target=self._hotkey_listener, daemon=True)
         self._stop_hotkey_listener = threading.Event()
         self._hotkey_listener_thread.start()
@@ -79,18 +150,7 @@ class TranscriptionWindow(QMainWindow):
         self.setWindowTitle("Linux Whisperer - Transcription")
         self.setMinimumSize(600, 400)
         
-        # Try to load the icon from the resources directory
-        icon_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "resources", "icons", "app_icon.png"
-        )
-        
-        # Check if the icon file exists
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-        else:
-            # Use a fallback icon
-            self.setWindowIcon(QIcon.fromTheme("audio-input-microphone"))
+        self.setWindowIcon(get_icon("app_icon"))
         
         # Set up the central widget
         self.central_widget = QWidget()
@@ -166,14 +226,16 @@ class TranscriptionWindow(QMainWindow):
         """
         Set up the transcription text edit.
         """
-        self.transcription_text = QTextEdit()
+        self.transcription_text = QPlainTextEdit()
         self.transcription_text.setReadOnly(True)
         self.transcription_text.setPlaceholderText("Transcription will appear here...")
         
-        # Set a monospaced font
-        font = QFont("Monospace")
-        font.setPointSize(12)
-        self.transcription_text.setFont(font)
+        # Set a monospaced font, prebuilt for every size option
+        self._fonts = [QFont("Monospace", size) for size in FONT_SIZES]
+        self.transcription_text.setFont(self._fonts[1])
+        
+        # Cursor for appending to the text
+        self._end_cursor = QTextCursor(self.transcription_text.document())
         
         self.layout.addWidget(self.transcription_text)
     
@@ -218,41 +280,85 @@ class TranscriptionWindow(QMainWindow):
         Args:
             text: The transcription text.
         """
-        print(f"[DEBUG] update_transcription called with text: '{text}'" )
+        logger.debug("update_transcription called with text: %r", text)
         
-        # Force clear placeholder text first
-        self.transcription_text.clear()
+        # The new text replaces anything still waiting to be appended
+        self._pending_text = text
+        self._pending_appends.clear()
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _append_transcription(self, text: str):
+        """
+        Add newly committed text to the end of the transcription.
+        
+        Args:
+            text: The text to add.
+        """
+        self._pending_appends.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush_transcription(self):
+        """
+        Apply the transcription updates received since the last flush.
+        """
+        text = self._pending_text
+        appends = self._pending_appends
+        if text is None and not appends:
+            return
+        self._pending_text = None
+        self._pending_appends = []
+        
+        # Only follow the text if the user has not scrolled up to read
+        scroll_bar = self.transcription_text.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 4
         
-        # Set the text directly
-        self.transcription_text.setPlainText(text)
+        # Coalesce the edit and scroll into a single repaint
+        self.transcription_text.setUpdatesEnabled(False)
+        
+        document = self.transcription_text.document()
+        if text is not None:
+            self.transcription_text.setPlainText(text)
+        if appends:
+            # Only the new words are inserted, so the cost does not grow
+            # with the length of the session
+            new_text = " ".join(appends)
+            self._end_cursor.movePosition(QTextCursor.MoveOperation.End)
+            self._end_cursor.insertText(new_text if document.isEmpty() else f" {new_text}")
+        
+        # Drop the oldest text beyond the limit
+        excess = document.characterCount() - MAX_TRANSCRIPTION_CHARS
+        if excess > 0:
+            trim_cursor = QTextCursor(document)
+            trim_cursor.setPosition(excess, QTextCursor.MoveMode.KeepAnchor)
+            trim_cursor.removeSelectedText()
         
         # Scroll to the bottom
-        cursor = self.transcription_text.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.transcription_text.setTextCursor(cursor)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+        
+        self.transcription_text.setUpdatesEnabled(True)
         
         # Update the status
         self.status_label.setText("Transcribing...")
-        
-        # Force UI update
-        from PyQt6.QtWidgets import QApplication
-        QApplication.processEvents()
-        
-        print(f"[DEBUG] UI updated with text: '{self.transcription_text.toPlainText()}'" )
     
     def _clear_transcription(self):
         """
         Clear the transcription text.
         """
         self.transcription_text.clear()
+        self._pending_appends.clear()
+        # Otherwise the next commit would bring the cleared text back
+        self._committed_text = ""
+        self._pending_text = None
         self.status_label.setText("Cleared")
     
     def _copy_transcription(self):
         """
         Copy the transcription text to the clipboard.
         """
-        self.transcription_text.selectAll()
-        self.transcription_text.copy()
+        QApplication.clipboard().setText(self.transcription_text.toPlainText())
         self.status_label.setText("Copied to clipboard")
     
     def _save_transcription(self):
@@ -267,13 +373,38 @@ class TranscriptionWindow(QMainWindow):
         )
         
         if file_path:
-            try:
-                with open(file_path, "w") as f:
-                    f.write(self.transcription_text.toPlainText())
-                    
-                self.status_label.setText(f"Saved to {file_path}")
-            except Exception as e:
-                self.status_label.setText(f"Error saving: {e}")
+            # Take the text now; the disk write happens off the GUI thread
+            text = self.transcription_text.toPlainText()
+            self.status_label.setText(f"Saving to {file_path}...")
+            threading.Thread(target=self._write_file, args=(file_path, text), daemon=True).start()
+    
+    def _write_file(self, file_path: str, text: str):
+        """
+        Write text to a file and report the outcome in the status bar.
+        
+        This runs on a worker thread.
+        
+        Args:
+            file_path: The file to write.
+            text: The text to write.
+        """
+        # Encode once and write in one go; the target is only replaced on commit
+        data = text.encode("utf-8")
+        f = QSaveFile(file_path)
+        if f.open(QIODevice.OpenModeFlag.WriteOnly) and f.write(data) == len(data) and f.commit():
+            self._status_changed.emit(f"Saved to {file_path}")
+        else:
+            f.cancelWriting()
+            self._status_changed.emit(f"Error saving: {f.errorString()}")
+    
+    def _set_status(self, text: str):
+        """
+        Show a message in the status bar.
+        
+        Args:
+            text: The message to show.
+        """
+        self.status_label.setText(text)
     
     def _insert_text(self):
         """
@@ -289,30 +420,43 @@ class TranscriptionWindow(QMainWindow):
         Args:
             index: The index of the selected font size.
         """
-        font = self.transcription_text.font()
+        if not 0 <= index < len(self._fonts):
+            return
         
-        if index == 0:  # Small
-            font.setPointSize(10)
-        elif index == 1:  # Medium
-            font.setPointSize(12)
-        elif index == 2:  # Large
-            font.setPointSize(14)
-        elif index == 3:  # Extra Large
-            font.setPointSize(16)
-            
-        self.transcription_text.setFont(font)
+        self.transcription_text.setUpdatesEnabled(False)
+        self.transcription_text.setFont(self._fonts[index])
+        self.transcription_text.setUpdatesEnabled(True)
+    
+    def shutdown(self):
+        """
+        Close the window for good, stopping transcription and the hotkey listener.
+        """
+        self._shutting_down = True
+        self.close()
     
     def closeEvent(self, event):
         """
         Handle the window close event.
         
+        Unless shutdown() was called, the window is only hidden so it can be
+        shown again without being rebuilt.
+        
         Args:
             event: The close event.
         """
+        self.stop_transcription()
+        
+        if not self._shutting_down:
+            event.ignore()
+            self.hide()
+            self.closed.emit()
+            return
+        
         # Stop hotkey listener thread
         self._stop_hotkey_listener.set()
         if self._hotkey_listener_thread.is_alive():
             self._hotkey_listener_thread.join(timeout=1)
+        self._transcriber.close()
         # Emit the closed signal
         self.closed.emit()
         
@@ -323,24 +467,39 @@ class TranscriptionWindow(QMainWindow):
         """
         Start the transcription process (actual audio capture wired up).
         """
-        if not self._transcribing:
+        if not self._transcribing and self.isVisible():
             self._transcribing = True
-            self._audio_thread_stop.clear()
+            
+            # Fresh events and queue, so threads of the previous session that
+            # outlived the join timeout keep seeing their own stop request
+            self._session += 1
+            self._audio_thread_stop = threading.Event()
+            self._segment_ready = threading.Event()
+            self._segment_queue = deque(maxlen=SEGMENT_QUEUE_SIZE)
 
             # Use selected audio device
             if self._selected_device_index is not None and self._audio_devices:
                 dev = self._audio_devices[self._selected_device_index]
-                msg = f"Using device: [{dev['index']}] {dev['name']} ({dev['maxInputChannels']}ch)"
+                msg = f"Using device: [{dev['index']}] {dev['name']} ({dev['max_input_channels']}ch)"
                 device_index = dev['index']
             else:
                 msg = "No audio input device selected!"
                 device_index = None
-            print(msg)
+            logger.info("%s", msg)
             self.status_label.setText(msg)
             self._transcription_buffer = []
+            self._committed_text = ""
             self.update_transcription("")
+            session_args = (self._session, self._audio_thread_stop, self._segment_ready, self._segment_queue)
+            # Start segment transcription thread
+            self._segment_thread = threading.Thread(
+                target=self._segment_transcription_thread, args=(self._transcriber, *session_args), daemon=True
+            )
+            self._segment_thread.start()
             # Start audio capture thread
-            self._audio_thread = threading.Thread(target=self._audio_capture_thread, args=(device_index,), daemon=True)
+            self._audio_thread = threading.Thread(
+                target=self._audio_capture_thread, args=(device_index, *session_args), daemon=True
+            )
             self._audio_thread.start()
 
     def stop_transcription(self):
@@ -351,49 +510,44 @@ class TranscriptionWindow(QMainWindow):
             self._transcribing = False
             # Stop audio thread and stream
             self._audio_thread_stop.set()
+            self._segment_ready.set()
             if self._audio_thread and self._audio_thread.is_alive():
                 self._audio_thread.join(timeout=2)
+            if self._segment_thread and self._segment_thread.is_alive():
+                self._segment_thread.join(timeout=2)
             if self._audio_stream is not None:
                 try:
-                    self._audio_stream.stop_stream()
+                    self._audio_stream.stop()
                     self._audio_stream.close()
                 except Exception:
                     pass
                 self._audio_stream = None
-            # Stop transcriber
-            self._transcriber.stop()
-            # Reinitialize transcriber for next session
-            self._transcriber = StreamingTranscriber()
-            self._transcriber.on_transcription = self._on_transcription_result
+            # The model process is kept for the next session and released in closeEvent
             self.status_label.setText("Transcription stopped.")
 
     def _populate_audio_devices(self):
         """
         Populate the audio device dropdown with available input devices.
         """
-        pa = pyaudio.PyAudio()
-        self._audio_devices = []
+        # Listed through sounddevice, which also opens the capture stream,
+        # so the indices refer to the same PortAudio enumeration
+        default_index = sd.default.device[0]
+        self._audio_devices = [dev for dev in sd.query_devices() if dev["max_input_channels"] > 0]
+        
+        # Fill the dropdown without firing _on_device_changed for every item
+        self.device_combo.blockSignals(True)
         self.device_combo.clear()
-        default_index = pa.get_default_input_device_info()["index"] if pa.get_device_count() > 0 else None
-        for i in range(pa.get_device_count()):
-            dev = pa.get_device_info_by_index(i)
-            if dev["maxInputChannels"] > 0:
-                self._audio_devices.append(dev)
-                label = f"[{dev['index']}] {dev['name']}"
-                self.device_combo.addItem(label)
+        self.device_combo.addItems([f"[{dev['index']}] {dev['name']}" for dev in self._audio_devices])
+        
         # Select default device
-        if default_index is not None:
-            for idx, dev in enumerate(self._audio_devices):
-                if dev["index"] == default_index:
-                    self.device_combo.setCurrentIndex(idx)
-                    self._selected_device_index = idx
-                    break
-        elif self._audio_devices:
-            self.device_combo.setCurrentIndex(0)
-            self._selected_device_index = 0
+        if self._audio_devices:
+            self._selected_device_index = next(
+                (idx for idx, dev in enumerate(self._audio_devices) if dev["index"] == default_index), 0
+            )
+            self.device_combo.setCurrentIndex(self._selected_device_index)
         else:
             self._selected_device_index = None
-        pa.terminate()
+        self.device_combo.blockSignals(False)
 
     def _on_device_changed(self, idx):
         """
@@ -404,135 +558,202 @@ class TranscriptionWindow(QMainWindow):
         else:
             self._selected_device_index = None
 
-    def _on_transcription_result(self, text, result):
-        """
-        Callback for StreamingTranscriber results.
-        """
-        self._invoke_in_main_thread(lambda: self.update_transcription(text))
-
-    def _audio_capture_thread(self, device_index):
+    def _audio_capture_thread(self, device_index, session: int, stop: threading.Event,
+                              segment_ready: threading.Event, segment_queue: deque):
         """
         Capture audio from the selected input device and stream to transcriber.
         Buffer audio chunks and send to transcriber when enough for a segment.
-        """
-        pa = pyaudio.PyAudio()
+        
+        PortAudio hands each block to a callback in its own buffer, so no
+        per-read bytes objects are allocated.
+        
+        Args:
+            device_index: The PortAudio index of the input device.
+            session: The session this thread belongs to.
+            stop: Set when the session ends.
+            segment_ready: Set when a segment is queued.
+            segment_queue: The session's queue of segments to transcribe.
+        """
+        # Samples are written straight into one preallocated segment buffer;
+        # their energy is summed during the conversion, so no second pass is
+        # needed for the silence check
+        audio_buffer = np.empty(SEGMENT_SAMPLES, dtype=np.float32)
+        pos = 0
+        energy = 0.0
+        silent = True
+        
+        def on_block(in_data, frame_count, time_info, status):
+            nonlocal pos, energy, silent
+            samples = np.frombuffer(in_data, dtype=np.int16)
+            while len(samples):
+                n = min(len(samples), SEGMENT_SAMPLES - pos)
+                energy += int16_to_float32(samples[:n], audio_buffer[pos:pos + n])
+                pos += n
+                samples = samples[n:]
+                if pos < SEGMENT_SAMPLES:
+                    break
+                
+                # Guard: skip segments below the speech RMS level, so
+                # the model never runs on silence
+                if energy / SEGMENT_SAMPLES >= ENERGY_VAD_RMS_THRESHOLD ** 2:
+                    # Hand the segment to the transcription thread; if it falls
+                    # behind, the oldest queued segment is dropped
+                    segment_queue.append(audio_buffer.copy())
+                    segment_ready.set()
+                    silent = False
+                elif not silent:
+                    # Speech just ended; let the transcription thread flush
+                    segment_queue.append(None)
+                    segment_ready.set()
+                    silent = True
+                
+                # The rest of the block starts the next segment
+                pos = 0
+                energy = 0.0
+        
         try:
-            stream = pa.open(
-                format=pyaudio.paInt16,
+            stream = sd.RawInputStream(
+                samplerate=16000,
                 channels=1,
-                rate=16000,
-                input=True,
-                input_device_index=device_index,
-                frames_per_buffer=1024
+                dtype='int16',
+                device=device_index,
+                blocksize=READ_FRAMES,
+                callback=on_block
             )
             self._audio_stream = stream
-            print(f"[Audio] Recording started on device index {device_index}")
-            self._transcriber.start()
-            audio_buffer = []
-            min_samples = 80000  # 5 seconds at 16kHz
-            while not self._audio_thread_stop.is_set():
-                try:
-                    data = stream.read(1024, exception_on_overflow=False)
-                    audio_np = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-                    audio_buffer.append(audio_np)
-                    total_samples = sum(arr.shape[0] for arr in audio_buffer)
-                    if total_samples >= min_samples:
-                        segment = np.concatenate(audio_buffer)
-                        # Guard: only transcribe if segment is 1D, float32, >= 16000 samples, not all zeros, no NaN/Inf
-                        has_nan = np.isnan(segment).any()
-                        has_inf = np.isinf(segment).any()
-                        if (segment.ndim == 1 and segment.dtype == np.float32 and segment.shape[0] >= 16000
-                            and not has_nan and not has_inf and not np.allclose(segment, 0)):
-                            # Always use auto-detection mode (which works reliably)
-                            # Keep UI language dropdown but ignore its value for now
-                            target_samples = 80000   # 5 seconds for auto detection
-                            print(f"[DEBUG] Using 5s segment with auto language detection")
-                            
-                            # Ensure segment is EXACTLY the target length (no more, no less)
-                            segment = segment[:target_samples]  # Truncate if too long
-                            if segment.shape[0] < target_samples:
-                                pad_width = target_samples - segment.shape[0]
-                                segment = np.pad(segment, (0, pad_width), mode='constant')
-                            
-                            # Debug: Print segment properties
-                            print(f"[DEBUG] FINAL Segment shape: {segment.shape}, dtype: {segment.dtype}, min: {segment.min()}, max: {segment.max()}, mean: {segment.mean()}")
-                            has_nan = np.isnan(segment).any()
-                            has_inf = np.isinf(segment).any()
-                            print(f"[DEBUG] Segment has_nan: {has_nan}, has_inf: {has_inf}")
-                            
-                            try:
-                                # Always use auto-detection (language=None)
-                                # This is the only mode that works reliably with short segments
-                                self._transcriber.recognizer.language = None
-                                result = self._transcriber.recognizer.transcribe_audio(segment, 16000)
-                                print(f"[DEBUG] Transcription result: text={result.get('text')}, full={result}")
-                                text = result["text"].strip()
-                                # Thread-safe approach: use PyQt signals
-                                print(f"[DEBUG] Got transcription text: {text}")
-                                # Create a copy of the text to avoid reference issues
-                                final_text = str(text)
-                                # Emit signal to update UI in the main thread
-                                print(f"[DEBUG] Emitting transcription_updated signal with text: {final_text}")
-                                self.transcription_updated.emit(final_text)
-                            except Exception as e:
-                                print(f"[Transcription] Error: {e}")
-                        audio_buffer = []
-                except Exception as e:
-                    print(f"[Audio] Error reading: {e}")
-                    break
-            print("[Audio] Recording stopped.")
-            stream.stop_stream()
+            logger.info("Recording started on device index %s", device_index)
+            stream.start()
+            stop.wait()
+            logger.info("Recording stopped")
+            stream.stop()
             stream.close()
         except Exception as e:
-            print(f"[Audio] Could not start stream: {e}")
+            logger.warning("Could not start stream: %s", e)
         finally:
-            pa.terminate()
-            self._audio_stream = None
+            if self._session == session:
+                self._audio_stream = None
+
+    def _segment_transcription_thread(self, transcriber, session: int, stop: threading.Event,
+                                      segment_ready: threading.Event, segment_queue: deque):
+        """
+        Transcribe the segments queued by the audio capture thread.
+        
+        Inference runs here so the capture thread can keep reading the
+        stream without overflowing. Segments are collected into a sliding
+        window that is decoded as a whole on every pass. Words that two
+        passes in a row agree on are committed and cut from the window, so
+        a word spanning a segment boundary is corrected by the next pass
+        instead of being split. When speech ends, the whole window is
+        committed.
+        
+        Args:
+            transcriber: The StreamingTranscriber whose model is used.
+            session: The session this thread belongs to.
+            stop: Set when the session ends.
+            segment_ready: Set when a segment is queued.
+            segment_queue: The session's queue of segments to transcribe.
+        """
+        window = np.empty(WINDOW_SAMPLES, dtype=np.float32)
+        window_len = 0
+        previous_words: List[Dict] = []  # Uncommitted words of the last pass
+        
+        while not stop.is_set():
+            segment_ready.wait()
+            segment_ready.clear()
+            if not segment_queue or stop.is_set():
+                continue
+            
+            # Take everything queued, so a slow pass does not fall further behind
+            flush = False
+            while segment_queue:
+                segment = segment_queue.popleft()
+                if segment is None:
+                    flush = True
+                    continue
+                if window_len + len(segment) > WINDOW_SAMPLES:
+                    # Nothing was confirmed for a whole window; keep the last
+                    # hypothesis and start over
+                    commit, _, previous_words = local_agreement(previous_words, [], window_len, flush=True)
+                    self._commit_words(commit, session)
+                    window_len = 0
+                window[window_len:window_len + len(segment)] = segment
+                window_len += len(segment)
+            if window_len == 0:
+                continue
+            
+            logger.debug("Decoding %.1fs window with auto language detection", window_len / 16000)
+            
+            try:
+                # Always use auto-detection (language=None)
+                # This is the only mode that works reliably with short segments
+                transcriber.recognizer.language = None
+                result = transcriber.recognizer.transcribe_audio(
+                    window[:window_len], 16000,
+                    word_timestamps=True,
+                    initial_prompt=self._committed_text or None
+                )
+                logger.debug("Transcription result: text=%r, full=%r", result.get('text'), result)
+            except Exception as e:
+                logger.warning("Transcription error: %s", e)
+                continue
+            
+            words = [word for segment in result["segments"] for word in segment["words"]]
+            
+            # On trailing silence nothing more will be added to these words,
+            # so all of them are committed
+            commit, cut, previous_words = local_agreement(words, previous_words, window_len, flush=flush)
+            self._commit_words(commit, session)
+            if cut:
+                window[:window_len - cut] = window[cut:window_len]
+                window_len -= cut
+        
+        # Keep whatever was heard last before stopping
+        self._commit_words([word["word"] for word in previous_words], session)
+    
+    def _commit_words(self, words: List[str], session: int):
+        """
+        Add words to the session transcript and append them to the window.
+        
+        Args:
+            words: The words to add, as returned by the recognizer.
+            session: The session the words were heard in; words of an
+                earlier session are dropped.
+        """
+        text = "".join(words).strip()
+        if not text or session != self._session:
+            return
+        
+        # Only the tail is kept, as the prompt for the next pass
+        self._committed_text = f"{self._committed_text} {text}".strip()[-PROMPT_CHARS:]
+        # Emit signal to update UI in the main thread
+        logger.debug("Emitting _text_committed signal with text: %r", text)
+        self._text_committed.emit(text)
 
     def _hotkey_listener(self):
         """
         Listen for Ctrl+Alt press/release globally and trigger transcription.
         """
-        ctrl_pressed = False
-        alt_pressed = False
+        held = 0  # HOTKEY_BITS of the modifiers currently down
         active = False
         def on_press(key):
-            nonlocal ctrl_pressed, alt_pressed, active
+            nonlocal held, active
             if self._stop_hotkey_listener.is_set():
                 return False
-            try:
-                if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                    ctrl_pressed = True
-                if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-                    alt_pressed = True
-                if ctrl_pressed and alt_pressed and not active:
-                    active = True
-                    # Start transcription in GUI thread
-                    self._invoke_in_main_thread(self.start_transcription)
-            except Exception:
-                pass
+            held |= HOTKEY_BITS.get(key, 0)
+            if held == HOTKEY_MASK and not active:
+                active = True
+                # Start transcription in GUI thread
+                self._start_requested.emit()
         def on_release(key):
-            nonlocal ctrl_pressed, alt_pressed, active
+            nonlocal held, active
             if self._stop_hotkey_listener.is_set():
                 return False
-            try:
-                if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                    ctrl_pressed = False
-                if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-                    alt_pressed = False
-                if active and (not ctrl_pressed or not alt_pressed):
-                    active = False
-                    # Stop transcription in GUI thread
-                    self._invoke_in_main_thread(self.stop_transcription)
-            except Exception:
-                pass
+            held &= ~HOTKEY_BITS.get(key, 0)
+            if active and held != HOTKEY_MASK:
+                active = False
+                # Stop transcription in GUI thread
+                self._stop_requested.emit()
         with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
-            while not self._stop_hotkey_listener.is_set():
-                time.sleep(0.1)
+            # Block without polling until the window shuts down
+            self._stop_hotkey_listener.wait()
             listener.stop()
-
-    def _invoke_in_main_thread(self, func):
-        # Ensure func is called in the Qt main thread
-        from PyQt6.QtCore import QTimer
-        print(f"[DEBUG] Scheduling function in main thread")
-        QTimer.singleShot(0, func)
@@ -8,10 +8,89 @@ This module provides functionality for detecting and executing
 voice commands in the transcribed text.
 """
 
+import logging
 import os
+import queue
 import re
+import shlex
+import shutil
 import subprocess
-from typing import Callable, Dict, List, Optional, Tuple, Union
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Mapping, Match, Optional, Pattern, Tuple, Union
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+# Percentage points the volume commands change the volume by
+VOLUME_STEP = 5
+
+logger = logging.getLogger(__name__)
+
+# A leading group of plain alternative words, e.g. "(?:open|launch|start)",
+# that is not made optional by a following quantifier
+TRIGGER_WORDS_RE = re.compile(r"\(\?:([a-z]+(?:\|[a-z]+)*)\)(?![?*]|\{0|\{,)", re.IGNORECASE)
+
+# Whitespace that must appear at least once, i.e. "\s" or "\s+"
+REQUIRED_WHITESPACE_RE = re.compile(r"\\s(?![?*{])")
+
+# Numbered backreferences, which would point at the wrong group once a
+# pattern is embedded in the combined command regex
+NUMBERED_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+# "$1", "$2", ... in custom shell commands refer to the pattern's groups
+PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+
+# Anything that needs a shell to interpret it, including variable assignments
+# and comments; "$" followed by a digit is a placeholder
+SHELL_METACHARACTERS_RE = re.compile(r"[|&;<>()`*?~\[\]{}\n=#]|\$(?!\d)")
+
+# Commands waiting to run; process_text blocks once this many are pending
+COMMAND_QUEUE_SIZE = 16
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """
+    Check whether a pattern has a "|" outside any group or character class,
+    so its leading group does not apply to the whole pattern.
+    
+    Args:
+        pattern: The regular expression to check.
+        
+    Returns:
+        True if the pattern is an alternation at the top level.
+    """
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 1
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right after "[" or "[^" is a literal
+            if pattern.startswith("^", i + 1):
+                i += 1
+            if pattern.startswith("]", i + 1):
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
 
 
 class CommandProcessor:
@@ -30,13 +109,28 @@ class CommandProcessor:
             commands_file: Path to a JSON file containing custom commands.
                 If None, only built-in commands will be available.
         """
+        # The display does not change during a session, so check it once
+        self._has_display = bool(os.environ.get('DISPLAY'))
+        
+        # The ALSA mixer, opened by the first volume command; False if it
+        # cannot be opened and amixer must be used instead
+        self._mixer = None
+        
         self.commands = self._load_default_commands()
         
         if commands_file and os.path.exists(commands_file):
             self._load_custom_commands(commands_file)
+        
+        self._compile_commands()
             
-        # Callbacks
+        # Callbacks; on_command_executed is called from the command thread
         self.on_command_executed = None
+        
+        # Handlers run on their own thread, so the thread that feeds
+        # process_text does not wait for xdotool or amixer
+        self._command_queue = queue.Queue(maxsize=COMMAND_QUEUE_SIZE)
+        self._command_thread = threading.Thread(target=self._run_commands, daemon=True)
+        self._command_thread.start()
     
     def _load_default_commands(self) -> Dict[str, Dict]:
         """
@@ -71,18 +165,28 @@ class CommandProcessor:
             },
             
             # Application control
-            r"(?:switch|change)\s+(?:to|)\s*(?:next|previous)\s+(?:app|application|window)": {
-                "handler": self._handle_switch_window,
-                "description": "Switch to the next or previous window",
+            r"(?:switch|change)\s+(?:to|)\s*next\s+(?:app|application|window)": {
+                "handler": self._handle_switch_next_window,
+                "description": "Switch to the next window",
                 "example": "switch to next window"
             },
+            r"(?:switch|change)\s+(?:to|)\s*previous\s+(?:app|application|window)": {
+                "handler": self._handle_switch_previous_window,
+                "description": "Switch to the previous window",
+                "example": "switch to previous window"
+            },
             
             # System control
-            r"(?:increase|decrease|raise|lower)\s+(?:the|)\s*volume": {
-                "handler": self._handle_volume_control,
-                "description": "Adjust the system volume",
+            r"(?:increase|raise)\s+(?:the|)\s*volume": {
+                "handler": self._handle_volume_up,
+                "description": "Raise the system volume",
                 "example": "increase the volume"
             },
+            r"(?:decrease|lower)\s+(?:the|)\s*volume": {
+                "handler": self._handle_volume_down,
+                "description": "Lower the system volume",
+                "example": "decrease the volume"
+            },
             
             # Linux Whisperer control
             r"(?:stop|pause)\s+(?:listening|recording|dictation)": {
@@ -117,25 +221,167 @@ class CommandProcessor:
                     if hasattr(self, command["handler"]):
                         command["handler"] = getattr(self, command["handler"])
                     else:
-                        # Create a shell command handler
+                        # Create a shell command handler; commands that need no
+                        # shell are split into arguments once, here
                         shell_command = command["handler"]
-                        command["handler"] = lambda text, match, cmd=shell_command: self._handle_shell_command(cmd, match)
+                        argv = None
+                        if not SHELL_METACHARACTERS_RE.search(shell_command):
+                            try:
+                                argv = shlex.split(shell_command)
+                            except ValueError:
+                                # e.g. an unbalanced quote; leave it to the shell
+                                pass
+                        command["handler"] = (
+                            lambda text, match, cmd=shell_command, argv=argv: self._handle_shell_command(cmd, match, argv)
+                        )
                         
                 self.commands[pattern] = command
                 
-            print(f"Loaded {len(custom_commands)} custom commands")
+            logger.info("Loaded %d custom commands", len(custom_commands))
         except Exception as e:
-            print(f"Error loading custom commands: {e}")
+            logger.error("Error loading custom commands: %s", e)
+    
+    def _compile_commands(self):
+        """
+        Compile the command patterns once, so matching does not go
+        through the re module's pattern cache on every call.
+        
+        The patterns are also joined into a single alternation, with each
+        command in a named group "cmd<index>", so detecting a command takes
+        one scan of the text instead of one per command. Patterns that
+        cannot be embedded in it (inline global flags, group names used by
+        another pattern, numbered backreferences) are matched separately.
+        Patterns that do not compile at all are reported and skipped.
+        
+        Text is lowercased before matching, so lowercase patterns are
+        matched case-sensitively, which is cheaper. Only patterns with
+        uppercase characters are matched ignoring case.
+        
+        Must be called again whenever self.commands changes, which also
+        rebuilds the descriptions returned by get_available_commands.
+        """
+        commands = []
+        regexes = []
+        for pattern, command in self.commands.items():
+            try:
+                regex = re.compile(pattern, 0 if pattern == pattern.lower() else re.IGNORECASE)
+            except re.error as e:
+                logger.error("Skipping command with invalid pattern %r: %s", pattern, e)
+                continue
+            commands.append((pattern, command))
+            regexes.append(regex)
+        
+        # Parallel lists indexed by command number, so matching needs no
+        # dictionary lookups
+        self._command_regexes: List[Pattern] = regexes
+        self._command_patterns: List[str] = [pattern for pattern, _ in commands]
+        self._command_handlers: List[Callable] = [command["handler"] for _, command in commands]
+        # Read-only, since the same descriptions are handed to every caller
+        self._command_descriptions: Tuple[Mapping[str, str], ...] = tuple(
+            MappingProxyType({
+                "pattern": pattern,
+                "description": command.get("description", "No description"),
+                "example": command.get("example", "No example")
+            })
+            for pattern, command in commands
+        )
+        
+        # Pick the patterns that can share the combined regex
+        group_names = {f"cmd{i}" for i in range(len(regexes))}
+        combined_sources = []
+        self._separate_commands: List[int] = []
+        for i, (pattern, regex) in enumerate(zip(self._command_patterns, regexes)):
+            source = pattern if pattern == pattern.lower() else f"(?i:{pattern})"
+            source = f"(?P<cmd{i}>{source})"
+            try:
+                re.compile(source)
+                embeddable = (
+                    group_names.isdisjoint(regex.groupindex)
+                    and NUMBERED_BACKREFERENCE_RE.search(pattern) is None
+                )
+            except re.error:
+                embeddable = False
+            
+            if embeddable:
+                group_names.update(regex.groupindex)
+                combined_sources.append(source)
+            else:
+                self._separate_commands.append(i)
+        
+        self._combined_regex: Optional[Pattern] = None
+        if combined_sources:
+            try:
+                self._combined_regex = re.compile("|".join(combined_sources))
+            except re.error as e:
+                logger.warning("Matching commands one by one: %s", e)
+                self._separate_commands = list(range(len(regexes)))
+        
+        # With Hyperscan, one pass of a single automaton tells which commands
+        # occur in the text; the regexes then only run for those. Patterns it
+        # cannot compile (e.g. backreferences) are always searched by regex.
+        self._hyperscan_db = None
+        self._regex_only_commands: List[int] = []
+        if hyperscan is not None:
+            flags = [
+                hyperscan.HS_FLAG_SINGLEMATCH
+                | (0 if pattern == pattern.lower() else hyperscan.HS_FLAG_CASELESS)
+                for pattern in self._command_patterns
+            ]
+            supported = []
+            for i, pattern in enumerate(self._command_patterns):
+                try:
+                    hyperscan.Database().compile(expressions=[pattern.encode()], flags=[flags[i]])
+                    supported.append(i)
+                except Exception as e:
+                    logger.debug("Matching %r by regex only: %s", pattern, e)
+                    self._regex_only_commands.append(i)
+            if supported:
+                try:
+                    db = hyperscan.Database()
+                    db.compile(
+                        expressions=[self._command_patterns[i].encode() for i in supported],
+                        ids=supported,
+                        elements=len(supported),
+                        flags=[flags[i] for i in supported]
+                    )
+                    self._hyperscan_db = db
+                except Exception as e:
+                    logger.info("Hyperscan unavailable for commands, using regex matching: %s", e)
+        
+        # Words at least one of which must appear in the text for any command
+        # to match, or None if some pattern does not start with a required
+        # plain word group that covers all of it
+        self._trigger_words: Optional[FrozenSet[str]] = frozenset()
+        # The shortest text any command can match, as far as can be told
+        # from the trigger words and the whitespace that follows them
+        self._min_command_length = 0
+        min_lengths = []
+        for pattern in self._command_patterns:
+            match = TRIGGER_WORDS_RE.match(pattern)
+            if match is None or _has_top_level_alternation(pattern):
+                self._trigger_words = None
+                break
+            words = match.group(1).lower().split("|")
+            self._trigger_words |= frozenset(words)
+            min_lengths.append(
+                min(map(len, words))
+                + (REQUIRED_WHITESPACE_RE.match(pattern, match.end()) is not None)
+            )
+        else:
+            self._min_command_length = min(min_lengths, default=0)
     
     def process_text(self, text: str) -> Tuple[bool, str]:
         """
         Process text to detect and execute commands.
         
+        A detected command is queued and run on the command thread, so
+        this method returns without waiting for it.
+        
         Args:
             text: The text to process.
             
         Returns:
-            A tuple of (command_executed, remaining_text).
+            A tuple of (command_detected, remaining_text).
         """
         if not text:
             return False, ""
@@ -143,44 +389,150 @@ class CommandProcessor:
         # Convert to lowercase for better matching
         lower_text = text.lower()
         
-        for pattern, command in self.commands.items():
-            match = re.search(pattern, lower_text, re.IGNORECASE)
-            if match:
-                try:
-                    # Execute the command handler
-                    result = command["handler"](text, match)
-                    
-                    # Call the callback if available
-                    if self.on_command_executed is not None:
-                        self.on_command_executed(pattern, match.group(0), result)
-                    
-                    # Remove the command from the text
-                    start, end = match.span()
-                    remaining_text = text[:start] + text[end:]
-                    
-                    return True, remaining_text.strip()
-                except Exception as e:
-                    print(f"Error executing command: {e}")
+        # Short fragments such as "uh" or "the" cannot hold a command
+        if len(lower_text) < self._min_command_length:
+            return False, text
+        
+        # Plain dictation rarely contains a trigger word; skip the regex then
+        # A substring test, since patterns do not require the trigger word
+        # to stand alone (e.g. "open" matches inside "reopen")
+        if self._trigger_words is not None and not any(word in lower_text for word in self._trigger_words):
+            return False, text
+        
+        found = self._find_command(lower_text)
+        if found is None:
+            return False, text
+        
+        index, match = found
+        self._command_queue.put(
+            (self._command_handlers[index], self._command_patterns[index], text, match)
+        )
+        
+        # Remove the command from the text
+        start, end = match.span()
+        if start == 0:
+            # Commands usually open or close an utterance; then a
+            # single slice is enough
+            remaining_text = text[end:]
+        elif end == len(text):
+            remaining_text = text[:start]
+        else:
+            remaining_text = "".join((text[:start], text[end:]))
+        
+        return True, remaining_text.strip()
+    
+    def _run_commands(self):
+        """
+        Run queued command handlers until None is queued.
+        
+        This method runs in a separate thread.
+        """
+        while True:
+            item = self._command_queue.get()
+            if item is None:
+                break
+            
+            handler, pattern, text, match = item
+            try:
+                # Execute the command handler
+                result = handler(text, match)
+                
+                # Call the callback if available
+                if self.on_command_executed is not None:
+                    self.on_command_executed(pattern, match.group(0), result)
+            except Exception as e:
+                logger.error("Error executing command: %s", e)
+    
+    def close(self):
+        """
+        Run the commands still queued, then stop the command thread.
+        """
+        if self._command_thread is None:
+            return
         
-        return False, text
+        self._command_queue.put(None)
+        self._command_thread.join(timeout=5.0)
+        self._command_thread = None
     
-    def get_available_commands(self) -> List[Dict]:
+    def _find_command(self, lower_text: str) -> Optional[Tuple[int, Match]]:
         """
-        Get a list of available commands.
+        Find the earliest command in the text.
         
+        With Hyperscan, a single scan collects the commands that occur in
+        the text, and only their regexes (and those of patterns Hyperscan
+        cannot compile) are searched for the earliest match. Otherwise the
+        combined regex finds it in one scan. Either way, at the same
+        position the earlier command wins.
+        
+        Args:
+            lower_text: The lowercased text to search.
+            
         Returns:
-            A list of command descriptions.
+            A tuple of (command index, match), where the match comes from
+            the command's own pattern, or None if no command matches.
         """
-        result = []
+        if self._hyperscan_db is not None and lower_text.isascii():
+            # Non-ASCII text is left to the regexes, which match characters
+            # rather than bytes. Each command is reported at most once.
+            candidates = set(self._regex_only_commands)
+            
+            def on_match(command_id, match_start, match_end, flags, context):
+                candidates.add(command_id)
+            
+            self._hyperscan_db.scan(lower_text.encode(), match_event_handler=on_match)
+            
+            # Ascending order, so at the same position the earlier command wins
+            best = None
+            for i in sorted(candidates):
+                match = self._command_regexes[i].search(lower_text)
+                if match is not None and (best is None or match.start() < best[1].start()):
+                    best = i, match
+            return best
         
-        for pattern, command in self.commands.items():
-            result.append({
-                "pattern": pattern,
-                "description": command.get("description", "No description"),
-                "example": command.get("example", "No example")
-            })
+        start = index = None
+        # Find the earliest command in a single scan
+        if self._combined_regex is not None:
+            combined_match = self._combined_regex.search(lower_text)
+            if combined_match is not None:
+                # The outer named group closes last, so it is the one reported
+                start, index = combined_match.start(), int(combined_match.lastgroup[3:])
+        
+        # Patterns kept out of the combined regex are searched one by one;
+        # at the same position the earlier command wins, as in the alternation
+        for i in self._separate_commands:
+            separate_match = self._command_regexes[i].search(lower_text)
+            if separate_match is not None and (start is None or (separate_match.start(), i) < (start, index)):
+                start, index = separate_match.start(), i
         
-        return result
+        if start is None:
+            return None
+        
+        # Match again with the command's own pattern, so handlers get
+        # the group numbers of that pattern
+        match = self._command_regexes[index].match(lower_text, start)
+        if match is None:
+            return None
+        return index, match
+    
+    def get_available_commands(self) -> Tuple[Mapping[str, str], ...]:
+        """
+        Get the available commands.
+        
+        The descriptions are built once, when the commands are compiled.
+        
+        Returns:
+            A tuple of read-only command descriptions.
+        """
+        return self._command_descriptions
+    
+    def _send_keys(self, *keys: str):
+        """
+        Send key chords to the active window with a single xdotool run.
+        
+        Args:
+            *keys: The key chords to send, in order (e.g. "ctrl+a").
+        """
+        subprocess.run(['xdotool', 'key', *keys], check=True)
     
     # Command handlers
     
@@ -197,13 +549,22 @@ class CommandProcessor:
         """
         app_name = match.group(1).strip().lower()
         
+        app_path = shutil.which(app_name)
+        if app_path is None:
+            logger.warning("Application not found: %s", app_name)
+            return False
+        
         try:
-            # Try to launch the application
-            subprocess.Popen([app_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            print(f"Opened application: {app_name}")
+            # Launch the application in its own session, so it outlives us
+            subprocess.Popen(
+                [app_path],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            logger.debug("Opened application: %s", app_name)
             return True
         except Exception as e:
-            print(f"Error opening application: {e}")
+            logger.error("Error opening application: %s", e)
             return False
     
     def _handle_close_window(self, text: str, match: re.Match) -> bool:
@@ -219,15 +580,15 @@ class CommandProcessor:
         """
         try:
             # Use xdotool to close the active window (X11 only)
-            if os.environ.get('DISPLAY'):
-                subprocess.run(['xdotool', 'key', 'alt+F4'], check=True)
-                print("Closed active window")
+            if self._has_display:
+                self._send_keys('alt+F4')
+                logger.debug("Closed active window")
                 return True
             else:
-                print("Close window command only supported on X11")
+                logger.warning("Close window command only supported on X11")
                 return False
         except Exception as e:
-            print(f"Error closing window: {e}")
+            logger.error("Error closing window: %s", e)
             return False
     
     def _handle_delete_text(self, text: str, match: re.Match) -> bool:
@@ -243,18 +604,16 @@ class CommandProcessor:
         """
         try:
             # Use keyboard shortcuts to delete text
-            if os.environ.get('DISPLAY'):
-                # Select to the start of the line
-                subprocess.run(['xdotool', 'key', 'shift+Home'], check=True)
-                # Delete the selection
-                subprocess.run(['xdotool', 'key', 'Delete'], check=True)
-                print("Deleted text")
+            if self._has_display:
+                # Select to the start of the line, then delete the selection
+                self._send_keys('shift+Home', 'Delete')
+                logger.debug("Deleted text")
                 return True
             else:
-                print("Delete text command only supported on X11")
+                logger.warning("Delete text command only supported on X11")
                 return False
         except Exception as e:
-            print(f"Error deleting text: {e}")
+            logger.error("Error deleting text: %s", e)
             return False
     
     def _handle_select_all(self, text: str, match: re.Match) -> bool:
@@ -270,20 +629,37 @@ class CommandProcessor:
         """
         try:
             # Use Ctrl+A to select all text
-            if os.environ.get('DISPLAY'):
-                subprocess.run(['xdotool', 'key', 'ctrl+a'], check=True)
-                print("Selected all text")
+            if self._has_display:
+                self._send_keys('ctrl+a')
+                logger.debug("Selected all text")
                 return True
             else:
-                print("Select all command only supported on X11")
+                logger.warning("Select all command only supported on X11")
                 return False
         except Exception as e:
-            print(f"Error selecting all text: {e}")
+            logger.error("Error selecting all text: %s", e)
             return False
     
     def _handle_switch_window(self, text: str, match: re.Match) -> bool:
         """
-        Handle the "switch window" command.
+        Handle a "switch window" command that may go either way.
+        
+        The built-in commands use _handle_switch_next_window and
+        _handle_switch_previous_window instead; this handler remains for
+        custom commands that refer to it by name.
+        
+        Args:
+            text: The original text.
+            match: The regex match object.
+            
+        Returns:
+            True if the command was executed successfully, False otherwise.
+        """
+        return self._switch_window('previous' in match.group(0).lower())
+    
+    def _handle_switch_next_window(self, text: str, match: re.Match) -> bool:
+        """
+        Handle the "switch to next window" command.
         
         Args:
             text: The original text.
@@ -292,25 +668,51 @@ class CommandProcessor:
         Returns:
             True if the command was executed successfully, False otherwise.
         """
+        return self._switch_window(False)
+    
+    def _handle_switch_previous_window(self, text: str, match: re.Match) -> bool:
+        """
+        Handle the "switch to previous window" command.
+        
+        Args:
+            text: The original text.
+            match: The regex match object.
+            
+        Returns:
+            True if the command was executed successfully, False otherwise.
+        """
+        return self._switch_window(True)
+    
+    def _switch_window(self, previous: bool) -> bool:
+        """
+        Switch to the next or previous window.
+        
+        Args:
+            previous: Whether to switch to the previous window.
+            
+        Returns:
+            True if the window was switched, False otherwise.
+        """
         try:
             # Use Alt+Tab to switch windows
-            if os.environ.get('DISPLAY'):
-                if 'previous' in match.group(0).lower():
-                    subprocess.run(['xdotool', 'key', 'alt+shift+Tab'], check=True)
-                else:
-                    subprocess.run(['xdotool', 'key', 'alt+Tab'], check=True)
-                print("Switched window")
+            if self._has_display:
+                self._send_keys('alt+shift+Tab' if previous else 'alt+Tab')
+                logger.debug("Switched window")
                 return True
             else:
-                print("Switch window command only supported on X11")
+                logger.warning("Switch window command only supported on X11")
                 return False
         except Exception as e:
-            print(f"Error switching window: {e}")
+            logger.error("Error switching window: %s", e)
             return False
     
     def _handle_volume_control(self, text: str, match: re.Match) -> bool:
         """
-        Handle the "volume control" command.
+        Handle a "volume control" command that may go either way.
+        
+        The built-in commands use _handle_volume_up and _handle_volume_down
+        instead; this handler remains for custom commands that refer to it
+        by name.
         
         Args:
             text: The original text.
@@ -319,19 +721,86 @@ class CommandProcessor:
         Returns:
             True if the command was executed successfully, False otherwise.
         """
+        command = match.group(0).lower()
+        if 'increase' in command or 'raise' in command:
+            return self._adjust_volume(VOLUME_STEP)
+        return self._adjust_volume(-VOLUME_STEP)
+    
+    def _handle_volume_up(self, text: str, match: re.Match) -> bool:
+        """
+        Handle the "increase volume" command.
+        
+        Args:
+            text: The original text.
+            match: The regex match object.
+            
+        Returns:
+            True if the command was executed successfully, False otherwise.
+        """
+        return self._adjust_volume(VOLUME_STEP)
+    
+    def _handle_volume_down(self, text: str, match: re.Match) -> bool:
+        """
+        Handle the "decrease volume" command.
+        
+        Args:
+            text: The original text.
+            match: The regex match object.
+            
+        Returns:
+            True if the command was executed successfully, False otherwise.
+        """
+        return self._adjust_volume(-VOLUME_STEP)
+    
+    def _adjust_volume(self, step: int) -> bool:
+        """
+        Change the system volume.
+        
+        Args:
+            step: The change in percentage points; negative lowers the volume.
+            
+        Returns:
+            True if the volume was changed, False otherwise.
+        """
+        mixer = self._get_mixer()
+        if mixer is not None:
+            try:
+                # getvolume picks up changes made by other programs
+                volume = mixer.getvolume()[0]
+                mixer.setvolume(max(0, min(100, volume + step)))
+                logger.debug("Changed volume by %+d%%", step)
+                return True
+            except alsaaudio.ALSAAudioError as e:
+                logger.error("Error controlling volume: %s", e)
+                return False
+        
         try:
             # Use amixer to control volume
-            if 'increase' in match.group(0).lower() or 'raise' in match.group(0).lower():
-                subprocess.run(['amixer', '-D', 'pulse', 'sset', 'Master', '5%+'], check=True)
-                print("Increased volume")
-            else:
-                subprocess.run(['amixer', '-D', 'pulse', 'sset', 'Master', '5%-'], check=True)
-                print("Decreased volume")
+            change = f"{abs(step)}%+" if step > 0 else f"{abs(step)}%-"
+            subprocess.run(['amixer', '-D', 'pulse', 'sset', 'Master', change], check=True)
+            logger.debug("Changed volume by %+d%%", step)
             return True
         except Exception as e:
-            print(f"Error controlling volume: {e}")
+            logger.error("Error controlling volume: %s", e)
             return False
     
+    def _get_mixer(self):
+        """
+        Get the ALSA master mixer, opening it on first use.
+        
+        Returns:
+            The mixer, or None if pyalsaaudio is not installed or the
+            mixer cannot be opened.
+        """
+        if self._mixer is None:
+            self._mixer = False
+            if alsaaudio is not None:
+                try:
+                    self._mixer = alsaaudio.Mixer('Master', device='pulse')
+                except alsaaudio.ALSAAudioError as e:
+                    logger.info("ALSA mixer unavailable, using amixer: %s", e)
+        return self._mixer or None
+    
     def _handle_stop_listening(self, text: str, match: re.Match) -> bool:
         """
         Handle the "stop listening" command.
@@ -344,7 +813,7 @@ class CommandProcessor:
             True if the command was executed successfully, False otherwise.
         """
         # This will be handled by the main application
-        print("Stop listening command detected")
+        logger.debug("Stop listening command detected")
         return True
     
     def _handle_start_listening(self, text: str, match: re.Match) -> bool:
@@ -359,29 +828,42 @@ class CommandProcessor:
             True if the command was executed successfully, False otherwise.
         """
         # This will be handled by the main application
-        print("Start listening command detected")
+        logger.debug("Start listening command detected")
         return True
     
-    def _handle_shell_command(self, command: str, match: re.Match) -> bool:
+    def _handle_shell_command(self, command: str, match: re.Match,
+                              argv: Optional[List[str]] = None) -> bool:
         """
         Handle a shell command.
         
         Args:
             command: The shell command to execute.
             match: The regex match object.
+            argv: The command split into arguments, if it can run without
+                a shell.
             
         Returns:
             True if the command was executed successfully, False otherwise.
         """
+        groups = match.groups()
+        
+        def expand(placeholder: re.Match) -> str:
+            index = int(placeholder.group(1))
+            if 1 <= index <= len(groups):
+                return groups[index - 1] or ""
+            return placeholder.group(0)
+        
         try:
             # Replace placeholders in the command with match groups
-            for i, group in enumerate(match.groups()):
-                command = command.replace(f"${i+1}", group)
-            
-            # Execute the shell command
-            subprocess.run(command, shell=True, check=True)
-            print(f"Executed shell command: {command}")
+            if argv is not None:
+                # Each group stays a single argument, whatever it contains
+                command = [PLACEHOLDER_RE.sub(expand, arg) for arg in argv]
+                subprocess.run(command, check=True)
+            else:
+                command = PLACEHOLDER_RE.sub(expand, command)
+                subprocess.run(command, shell=True, check=True)
+            logger.debug("Executed shell command: %s", command)
             return True
         except Exception as e:
-            print(f"Error executing shell command: {e}")
+            logger.error("Error executing shell command: %s", e)
             return False
@@ -8,10 +8,36 @@ This module provides functionality for injecting text into active applications
 on Linux using various methods (X11, Wayland, etc.).
 """
 
+import functools
+import logging
 import os
+import shutil
 import subprocess
 import time
-from typing import Optional
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keysym names for characters whose keysym name is not the character itself
+SPECIAL_KEYSYM_NAMES = {
+    ' ': 'space',
+    '\n': 'Return',
+    '\t': 'Tab',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _which(command: str) -> bool:
+    """
+    Check if a command is on the PATH, remembering the answer.
+    
+    Args:
+        command: The command to check.
+        
+    Returns:
+        True if the command is available, False otherwise.
+    """
+    return shutil.which(command) is not None
 
 
 class TextInjector:
@@ -55,11 +81,26 @@ class TextInjector:
                 import Xlib.display
                 import Xlib.X
                 import Xlib.XK
-                import Xlib.protocol.event
+                from Xlib.ext import xtest
+                
+                # Keep the modules around so injection does not re-import them
+                self._X = Xlib.X
+                self._XK = Xlib.XK
+                self._xtest = xtest
                 
                 self.display = Xlib.display.Display()
                 self.root = self.display.screen().root
+                self._xlib_shift_keycode = self.display.keysym_to_keycode(Xlib.XK.XK_Shift_L)
                 self._backend = 'xlib'
+                
+                # Character -> (keycode, needs_shift), or () if untypable;
+                # printable ASCII is mapped up front, anything else on first use
+                self._xlib_keys = {
+                    char: self._lookup_xlib_key(char)
+                    for char in map(chr, range(0x20, 0x7f))
+                }
+                for char in SPECIAL_KEYSYM_NAMES:
+                    self._xlib_keys[char] = self._lookup_xlib_key(char)
             except ImportError:
                 # Fall back to xdotool
                 self._check_command('xdotool')
@@ -75,7 +116,7 @@ class TextInjector:
         else:
             raise RuntimeError(f"Unsupported display server: {self.display_server}")
         
-        print(f"Using text injection backend: {self._backend} on {self.display_server}")
+        logger.info("Using text injection backend: %s on %s", self._backend, self.display_server)
     
     def _check_command(self, command: str) -> bool:
         """
@@ -87,11 +128,7 @@ class TextInjector:
         Returns:
             True if the command is available, False otherwise.
         """
-        try:
-            subprocess.run(['which', command], check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return _which(command)
     
     def inject_text(self, text: str):
         """
@@ -119,7 +156,11 @@ class TextInjector:
         Args:
             text: The text to inject.
         """
-        subprocess.run(['xdotool', 'type', '--clearmodifiers', text], check=True)
+        # Pass the text through a pipe rather than as one large argument
+        subprocess.run(
+            ['xdotool', 'type', '--clearmodifiers', '--file', '-'],
+            input=text.encode('utf-8'), check=True
+        )
     
     def _inject_with_wtype(self, text: str):
         """
@@ -146,68 +187,63 @@ class TextInjector:
     
     def _inject_with_xlib(self, text: str):
         """
-        Inject text using Xlib.
+        Inject text using the XTEST extension.
+        
+        All key events are queued and sent to the X server in one go.
         
         Args:
             text: The text to inject.
         """
-        import Xlib.display
-        import Xlib.X
-        import Xlib.XK
-        import Xlib.protocol.event
-        
-        # Get the active window
-        window = self.display.get_input_focus().focus
+        fake_input = self._xtest.fake_input
+        key_press = self._X.KeyPress
+        key_release = self._X.KeyRelease
+        shift = self._xlib_shift_keycode
         
-        # Send each character as a key press event
         for char in text:
-            # Convert character to keysym
-            keysym = Xlib.XK.string_to_keysym(char)
-            if keysym == 0:
-                # Handle special characters
-                if char == ' ':
-                    keysym = Xlib.XK.XK_space
-                elif char == '\n':
-                    keysym = Xlib.XK.XK_Return
-                elif char == '\t':
-                    keysym = Xlib.XK.XK_Tab
-                else:
-                    continue
+            key = self._xlib_keys.get(char)
+            if key is None:
+                key = self._xlib_keys[char] = self._lookup_xlib_key(char)
+            if not key:
+                continue
+            keycode, shifted = key
             
-            # Get the keycode
-            keycode = self.display.keysym_to_keycode(keysym)
-            
-            # Send key press event
-            event = Xlib.protocol.event.KeyPress(
-                time=int(time.time()),
-                root=self.root,
-                window=window,
-                same_screen=1,
-                child=Xlib.X.NONE,
-                root_x=0, root_y=0, event_x=0, event_y=0,
-                state=0,
-                detail=keycode
-            )
-            window.send_event(event, propagate=True)
-            
-            # Send key release event
-            event = Xlib.protocol.event.KeyRelease(
-                time=int(time.time()),
-                root=self.root,
-                window=window,
-                same_screen=1,
-                child=Xlib.X.NONE,
-                root_x=0, root_y=0, event_x=0, event_y=0,
-                state=0,
-                detail=keycode
-            )
-            window.send_event(event, propagate=True)
-            
-            # Flush the display
-            self.display.flush()
+            if shifted:
+                fake_input(self.display, key_press, shift)
+            fake_input(self.display, key_press, keycode)
+            fake_input(self.display, key_release, keycode)
+            if shifted:
+                fake_input(self.display, key_release, shift)
+        
+        # Send everything with a single round trip
+        self.display.sync()
+    
+    def _lookup_xlib_key(self, char: str) -> Tuple[int, bool]:
+        """
+        Find the key that types a character.
+        
+        Args:
+            char: The character to look up.
             
-            # Small delay to prevent overwhelming the application
-            time.sleep(0.01)
+        Returns:
+            A tuple of (keycode, needs_shift), or an empty tuple if no key
+            on the current keyboard mapping produces the character.
+        """
+        # Convert character to keysym
+        keysym = self._XK.string_to_keysym(char)
+        if keysym == 0 and char in SPECIAL_KEYSYM_NAMES:
+            # Handle special characters
+            keysym = self._XK.string_to_keysym(SPECIAL_KEYSYM_NAMES[char])
+        elif keysym == 0 and 0x20 < ord(char) < 0x7f:
+            # Keysyms for printable ASCII equal their code points
+            keysym = ord(char)
+        if keysym == 0:
+            return ()
+        
+        # Index 0 of a keycode is the unshifted symbol, index 1 the shifted one
+        for keycode, index in self.display.keysym_to_keycodes(keysym):
+            if index in (0, 1):
+                return keycode, index == 1
+        return ()
     
     def get_active_application(self) -> Optional[str]:
         """
@@ -217,17 +253,17 @@ class TextInjector:
             The name of the active application, or None if it cannot be determined.
         """
         if self.display_server == 'x11':
+            if self._backend == 'xlib':
+                return self._get_active_application_xlib()
             try:
-                output = subprocess.check_output(
-                    ['xprop', '-id', '$(xdotool getactivewindow)', 'WM_CLASS'],
-                    shell=True, text=True
-                )
+                window_id = subprocess.check_output(['xdotool', 'getactivewindow'], text=True).strip()
+                output = subprocess.check_output(['xprop', '-id', window_id, 'WM_CLASS'], text=True)
                 if 'WM_CLASS' in output:
                     # Extract application name
                     parts = output.split('"')
-                    if len(parts) >= 3:
+                    if len(parts) >= 4:
                         return parts[3]
-            except subprocess.CalledProcessError:
+            except (subprocess.CalledProcessError, OSError):
                 pass
         elif self.display_server == 'wayland':
             # This is more complex on Wayland and depends on the compositor
@@ -235,3 +271,25 @@ class TextInjector:
             return "Unknown (Wayland)"
             
         return None
+    
+    def _get_active_application_xlib(self) -> Optional[str]:
+        """
+        Get the name of the active application over the open Xlib connection.
+        
+        Returns:
+            The WM_CLASS class name of the focused window, or None if it
+            cannot be determined.
+        """
+        window = self.display.get_input_focus().focus
+        if isinstance(window, int):
+            # No focus, or focus follows the pointer (X.NONE / X.PointerRoot)
+            return None
+        
+        # Focus is often on a child of the top-level window that carries WM_CLASS
+        while window and window != self.root:
+            wm_class = window.get_wm_class()
+            if wm_class:
+                return wm_class[1]
+            window = window.query_tree().parent
+        
+        return None
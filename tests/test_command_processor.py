@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the command processor.
+
+These tests cover command detection in transcribed text; command
+handlers are replaced so nothing is run on the system.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the source directory to the Python path, as the application does;
+# importing through the src package would load the speech recognizer too
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils import command_processor
+from utils.command_processor import CommandProcessor
+
+
+@pytest.fixture
+def shell_calls(monkeypatch):
+    """Record shell commands instead of running them."""
+    calls = []
+    
+    def run(command, shell=False, **kwargs):
+        calls.append((command, shell))
+    
+    monkeypatch.setattr(command_processor.subprocess, "run", run)
+    return calls
+
+
+@pytest.fixture
+def make_processor(tmp_path):
+    """Create command processors with the given custom commands."""
+    processors = []
+    
+    def make(custom_commands=None):
+        commands_file = None
+        if custom_commands is not None:
+            commands_file = tmp_path / "commands.json"
+            commands_file.write_text(json.dumps(custom_commands))
+        processor = CommandProcessor(str(commands_file) if commands_file else None)
+        # Record which command ran; called on the command thread
+        processor.executed = []
+        processor.on_command_executed = lambda pattern, text, result: processor.executed.append(pattern)
+        processors.append(processor)
+        return processor
+    
+    yield make
+    for processor in processors:
+        processor.close()
+
+
+def test_top_level_alternation_disables_trigger_prefilter(make_processor, shell_calls):
+    processor = make_processor({r"(?:foo|bar)\s+baz|hello there": {"handler": "echo hi"}})
+    
+    assert processor.process_text("hello there") == (True, "")
+    processor.close()
+    assert shell_calls == [(["echo", "hi"], False)]
+
+
+def test_earliest_command_wins(make_processor, shell_calls):
+    processor = make_processor({
+        r"alpha (\w+)": {"handler": "echo alpha $1"},
+        r"beta": {"handler": "echo beta"},
+    })
+    
+    assert processor.process_text("say beta then alpha one") == (True, "say  then alpha one")
+    processor.close()
+    assert processor.executed == ["beta"]
+
+
+def test_earlier_command_wins_at_same_position(make_processor, shell_calls):
+    processor = make_processor({
+        r"go (\w+)": {"handler": "echo anywhere $1"},
+        r"go home": {"handler": "echo home"},
+    })
+    
+    assert processor.process_text("go home") == (True, "")
+    processor.close()
+    assert shell_calls == [(["echo", "anywhere", "home"], False)]
+
+
+def test_builtin_command_removed_from_text(make_processor, shell_calls):
+    processor = make_processor()
+    
+    assert processor.process_text("Select all") == (True, "")
+    assert processor.process_text("dictated text") == (False, "dictated text")
+    processor.close()
+    assert processor.executed == [r"(?:select|highlight)\s+(?:all|everything)"]
+
+
+def test_invalid_pattern_is_skipped(make_processor, shell_calls):
+    processor = make_processor({
+        r"broken (": {"handler": "echo broken"},
+        r"fine": {"handler": "echo fine"},
+    })
+    
+    assert r"broken (" not in [command["pattern"] for command in processor.get_available_commands()]
+    assert processor.process_text("fine") == (True, "")
+    processor.close()
+    assert shell_calls == [(["echo", "fine"], False)]
+
+
+@pytest.mark.parametrize("pattern, text, expected", [
+    # A global flag cannot be embedded in the combined regex
+    (r"(?s)note (\w+)", "note this", ["echo", "this"]),
+    # The group name is also used by another command
+    (r"call (?P<name>\w+)", "call home", ["echo", "home"]),
+    # A numbered backreference would point at another command's group
+    (r"(\w+) twice \1", "go twice go", ["echo", "go"]),
+    # Uppercase patterns are matched ignoring case
+    (r"Shout (\w+)", "shout hey", ["echo", "hey"]),
+])
+def test_custom_pattern_keeps_its_own_groups(make_processor, shell_calls, pattern, text, expected):
+    processor = make_processor({
+        r"(?P<name>\w+) please": {"handler": "echo polite"},
+        pattern: {"handler": "echo $1"},
+    })
+    
+    assert processor.process_text(text) == (True, "")
+    processor.close()
+    assert shell_calls == [(expected, False)]
+
+
+def test_trigger_words_skip_dictation(make_processor):
+    processor = make_processor()
+    
+    assert "open" in processor._trigger_words
+    assert processor.process_text("uh") == (False, "uh")
+    assert processor.process_text("nothing to do here") == (False, "nothing to do here")
+    processor.close()
+    assert processor.executed == []
+
+
+def test_trigger_words_match_inside_words(make_processor, shell_calls):
+    processor = make_processor({r"(?:go)\s*up": {"handler": "echo up"}})
+    
+    assert processor.process_text("goup") == (True, "")
+    processor.close()
+    assert shell_calls == [(["echo", "up"], False)]
+
+
+def test_pattern_without_trigger_group_disables_prefilter(make_processor):
+    processor = make_processor({r"\w+ now": {"handler": "echo now"}})
+    
+    assert processor._trigger_words is None
+    processor.close()
+
+
+def test_placeholders_expand_to_single_arguments(make_processor, shell_calls):
+    processor = make_processor({
+        r"find (\w+) in (.+)": {"handler": "grep -r $1 $2 $3"},
+    })
+    
+    assert processor.process_text("find todo in my notes") == (True, "")
+    processor.close()
+    # An unmatched placeholder is left as it is
+    assert shell_calls == [(["grep", "-r", "todo", "my notes", "$3"], False)]
+
+
+@pytest.mark.parametrize("handler", [
+    "LANG=C echo $1",
+    "echo $1 # comment",
+    "echo $1 | wc -c",
+    "echo 'unbalanced $1",
+])
+def test_shell_syntax_runs_through_shell(make_processor, shell_calls, handler):
+    processor = make_processor({r"shell (\w+)": {"handler": handler}})
+    
+    assert processor.process_text("shell word") == (True, "")
+    processor.close()
+    assert shell_calls == [(handler.replace("$1", "word"), True)]
+
+
+def test_handler_naming_method_is_resolved(make_processor, shell_calls):
+    processor = make_processor({r"everything please": {"handler": "_handle_select_all"}})
+    
+    assert processor.process_text("everything please") == (True, "")
+    processor.close()
+    assert processor.executed == ["everything please"]
+
+
+def test_earliest_start_wins_over_earliest_end(make_processor, shell_calls):
+    # "mom" ends first, but the command around it starts earlier
+    processor = make_processor({
+        r"mom": {"handler": "echo mom"},
+        r"call (\w+) now": {"handler": "echo $1"},
+    })
+    
+    assert processor.process_text("call mom now please") == (True, "please")
+    processor.close()
+    assert shell_calls == [(["echo", "mom"], False)]
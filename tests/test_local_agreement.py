@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the LocalAgreement-2 commit policy.
+
+These tests cover the commit and cut decisions of the streaming
+transcription window, including the silence-flush and overflow cases.
+"""
+
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.local_agreement import local_agreement
+
+
+def _words(*timed):
+    """Build word dicts from (word, end) pairs."""
+    return [{"word": word, "end": end} for word, end in timed]
+
+
+def test_commits_agreed_prefix_and_cuts_after_it():
+    previous = _words((" hello", 0.4), (" word", 0.8))
+    words = _words((" hello", 0.5), (" world", 0.9), (" again", 1.2))
+    
+    commit, cut, pending = local_agreement(words, previous, window_len=32000)
+    
+    assert commit == [" hello"]
+    assert cut == 8000
+    assert pending == words[1:]
+
+
+def test_nothing_committed_without_agreement():
+    words = _words((" hello", 0.5))
+    
+    commit, cut, pending = local_agreement(words, [], window_len=16000)
+    
+    assert commit == []
+    assert cut == 0
+    assert pending == words
+
+
+def test_cut_never_exceeds_window():
+    previous = _words((" hello", 1.5))
+    words = _words((" hello", 1.5))
+    
+    _, cut, _ = local_agreement(words, previous, window_len=16000)
+    
+    assert cut == 16000
+
+
+def test_silence_flush_commits_every_word():
+    previous = _words((" hello", 0.4))
+    words = _words((" hallo", 0.5), (" world", 0.9))
+    
+    commit, cut, pending = local_agreement(words, previous, window_len=24000, flush=True)
+    
+    assert commit == [" hallo", " world"]
+    assert cut == 24000
+    assert pending == []
+
+
+def test_overflow_keeps_last_hypothesis():
+    # A full window with nothing confirmed flushes the previous pass's words
+    previous = _words((" still", 10.0), (" talking", 20.0))
+    
+    commit, cut, pending = local_agreement(previous, [], window_len=480000, flush=True)
+    
+    assert commit == [" still", " talking"]
+    assert cut == 480000
+    assert pending == []